@@ -3,15 +3,24 @@ Journal Sync Pipeline
 Converts natural journal entries from Google Docs into structured data for the portfolio.
 """
 
-from .parser import parse_journal, parse_journal_file
-from .stats import compute_all_stats, load_books_config, load_entries, merge_entries, update_weeks
+from .parser import parse_journal_file
+from .stats import (
+    StatsAggregate,
+    compute_all_stats,
+    load_books_config,
+    load_entries,
+    merge_entries,
+    merge_entries_with_delta,
+    update_weeks,
+)
 
 __all__ = [
-    "parse_journal",
     "parse_journal_file",
     "compute_all_stats",
     "load_books_config",
     "load_entries",
     "merge_entries",
+    "merge_entries_with_delta",
+    "StatsAggregate",
     "update_weeks",
 ]
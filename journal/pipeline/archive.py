@@ -0,0 +1,164 @@
+"""
+Streaming parser for multi-week journal archives.
+Reads a journal line by line and yields goals, day and review records as
+each top-level section closes, so memory stays bounded by the largest
+section rather than the size of the file.
+"""
+
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+try:
+    from .fallback_parser import (
+        day_name_to_offset,
+        get_week_start_date,
+        parse_day_section,
+        parse_goals_text,
+        parse_review_section,
+        parse_week_identifier,
+    )
+    from .sections import TOP_HEADING_RE, index_journal
+except ImportError:
+    from fallback_parser import (
+        day_name_to_offset,
+        get_week_start_date,
+        parse_day_section,
+        parse_goals_text,
+        parse_review_section,
+        parse_week_identifier,
+    )
+    from sections import TOP_HEADING_RE, index_journal
+
+# "Week of January 6, 2026", "Week of Jan 6 2026"
+WEEK_HEADER_RE = re.compile(r'Week of\s+([A-Za-z]+)\.?\s+(\d{1,2}),?\s+(\d{4})', re.IGNORECASE)
+
+
+def week_from_header(title: str) -> Optional[str]:
+    """ISO week id ("2026-W02") of the date in a "Week of ..." heading, or None."""
+    match = WEEK_HEADER_RE.match(title)
+    if not match:
+        return None
+    month, day, year = match.groups()
+    try:
+        date = datetime.strptime(f"{month[:3]} {day} {year}", "%b %d %Y")
+    except ValueError:
+        return None
+    iso_year, iso_week = date.isocalendar()[:2]
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def iter_sections(lines: Iterator[str]) -> Iterator[tuple[int, str]]:
+    """
+    Group lines into top-level sections, yielding (line number, text) for
+    each as soon as the next "# " heading (or the end of input) closes it.
+    """
+    buffer = []
+    start = 1
+    for number, line in enumerate(lines, 1):
+        if number == 1:
+            line = line.lstrip("\ufeff")
+        if TOP_HEADING_RE.match(line) and buffer:
+            yield start, "".join(buffer)
+            buffer = []
+            start = number
+        buffer.append(line)
+    if buffer:
+        yield start, "".join(buffer)
+
+
+def iter_journal_records(source: Union[str, Path, IO[str]], week_id: Optional[str] = None) -> Iterator[dict]:
+    """
+    Stream records out of a journal file or file-like object:
+        {"type": "goals", "week": "2026-W02", "goals": [...]}
+        {"type": "day", "week": "2026-W02", "date": "2026-01-05", "day": {...}}
+        {"type": "review", "week": "2026-W02", "review": {...}}
+
+    Each "# Week of Month D, YYYY" heading starts a new week; week_id is
+    the week for anything before the first such heading (e.g. a single
+    weeks/*.md file with no header). Day dates and parsing follow
+    parse_journal_fallback.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, encoding="utf-8-sig") as f:
+            yield from iter_journal_records(f, week_id)
+        return
+
+    week = week_id
+    week_start = get_week_start_date(*parse_week_identifier(week)) if week else None
+    goals = None        # The current week's goals, once seen
+    reviewed = False
+
+    for line_number, text in iter_sections(source):
+        index = index_journal(text)
+        section = index.sections[-1]
+
+        if section["kind"] == "week":
+            header_week = week_from_header(section["title"])
+            if header_week is None:
+                raise ValueError(f"Line {line_number}: can't read a date from '# {section['title']}'")
+            week = header_week
+            week_start = get_week_start_date(*parse_week_identifier(week))
+            goals = None
+            reviewed = False
+
+        if week is None:
+            if section["kind"] == "day" or index.goals or index.review:
+                raise ValueError(f"Line {line_number}: journal content comes before any '# Week of' heading")
+            continue
+
+        if index.goals and goals is None:
+            goals = parse_goals_text(index.slice(index.goals))
+            yield {"type": "goals", "week": week, "goals": goals}
+
+        if section["kind"] == "day":
+            date = week_start + timedelta(days=day_name_to_offset(section["name"]))
+            day_text = text[section["body_start"]:section["end"]]
+            yield {
+                "type": "day",
+                "week": week,
+                "date": date.strftime("%Y-%m-%d"),
+                "day": parse_day_section(day_text, section["name"], index.subsections(section))
+            }
+
+        if index.review and not reviewed:
+            reviewed = True
+            yield {"type": "review", "week": week, "review": parse_review_section(index.slice(index.review), goals or [])}
+
+
+def iter_archive_weeks(source: Union[str, Path, IO[str]], week_id: Optional[str] = None) -> Iterator[tuple[str, dict]]:
+    """
+    Stream (week_id, parsed) pairs, one per week as it closes, where parsed
+    has the same shape as parse_journal_fallback's result.
+    """
+    week = None
+    parsed = None
+    for record in iter_journal_records(source, week_id):
+        if record["week"] != week:
+            if parsed is not None:
+                yield week, parsed
+            week = record["week"]
+            parsed = {"weekly_goals": [], "days": {}, "week_review": {}}
+
+        if record["type"] == "goals":
+            parsed["weekly_goals"] = record["goals"]
+        elif record["type"] == "day":
+            parsed["days"][record["date"]] = record["day"]
+        else:
+            parsed["week_review"] = record["review"]
+
+    if parsed is not None:
+        yield week, parsed
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python archive.py <journal.md> [week_id]")
+        sys.exit(1)
+
+    for record in iter_journal_records(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None):
+        print(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,98 @@
+"""
+Microbenchmark: JSON extraction from adversarial model outputs.
+
+Compares the old regex-based extract_json (greedy {...} / [...] searches,
+each retried with json.loads) against the single-pass scanner in jsonscan.
+Each case is run at growing sizes so the scaling is visible: the regex
+version goes quadratic on unclosed braces (and json.loads on a deeply
+nested span can hit the recursion limit), the scanner stays linear.
+
+Usage:
+    python bench_extract_json.py [--sizes=1000,4000,16000]
+"""
+import json
+import re
+import sys
+import time
+from typing import Optional
+
+from jsonscan import extract_json
+
+DAY = {"practice": {"leetcode": [{"name": "Two Sum", "difficulty": "easy", "insight": "hash map {seen}"}]},
+       "notes": "Brackets ] and braces } inside strings"}
+
+
+def legacy_extract_json(response: str):
+    """extract_json as it was before jsonscan: up to four regex searches."""
+    if not response:
+        return None
+    match = re.search(r'```(?:json)?\s*([\s\S]*?)```', response)
+    if match:
+        try:
+            return json.loads(match.group(1).strip())
+        except json.JSONDecodeError:
+            pass
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        pass
+    match = re.search(r'(\{[\s\S]*\})', response)
+    if match:
+        try:
+            return json.loads(match.group(1))
+        except json.JSONDecodeError:
+            pass
+    match = re.search(r'(\[[\s\S]*\])', response)
+    if match:
+        try:
+            return json.loads(match.group(1))
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+def make_cases(n: int) -> dict:
+    """Adversarial outputs of roughly n characters."""
+    answer = json.dumps(DAY)
+    return {
+        "chatty prose, answer last": "Let me think about this step by step. " * (n // 38) + answer,
+        "unclosed braces": "{ " * (n // 2),
+        "unclosed brackets": "[ " * (n // 2),
+        "answer then { chatter": answer + " Note: {" * (n // 8),
+        "many small invalid objects": "{ not json } " * (n // 13) + answer,
+        "unclosed code fence": "```json\n" + "``` " * (n // 4),
+        "long valid answer": json.dumps({"notes": "x" * n}),
+    }
+
+
+def time_call(fn, text: str, budget: float = 2.0) -> Optional[float]:
+    """Mean seconds per call, repeating until the budget or 50 runs (None if it crashed)."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        try:
+            fn(text)
+        except RecursionError:
+            return None
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > budget or runs >= 50:
+            return elapsed / runs
+
+
+if __name__ == "__main__":
+    sizes = [1000, 4000, 16000]
+    for arg in sys.argv[1:]:
+        if arg.startswith("--sizes="):
+            sizes = [int(x) for x in arg.split("=", 1)[1].split(",")]
+
+    print(f"{'case':<30} {'size':>7} {'regex':>10} {'scanner':>10} {'speedup':>8}")
+    for size in sizes:
+        for name, text in make_cases(size).items():
+            old = time_call(legacy_extract_json, text)
+            new = time_call(extract_json, text)
+            if old is None:
+                print(f"{name:<30} {len(text):>7} {'crashed':>10} {new * 1000:>8.2f}ms {'-':>8}")
+            else:
+                print(f"{name:<30} {len(text):>7} {old * 1000:>8.2f}ms {new * 1000:>8.2f}ms {old / new:>7.1f}x")
+        print()
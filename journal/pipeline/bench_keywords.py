@@ -0,0 +1,72 @@
+"""
+Microbenchmark: book alias matching as the config grows.
+
+Compares the old loop (one substring check per alias per line) against a
+KeywordMatcher built from the same aliases. The real books.json aliases
+are padded with generated books of 4 aliases each, so the cost per line
+can be seen at today's config size and at larger ones. The loop's cost
+grows with the number of aliases; the matcher's depends only on the
+length of the line.
+
+Usage:
+    python bench_keywords.py [--books=0,25,100,400]
+"""
+import sys
+import time
+
+from fallback_parser import load_book_aliases
+from keywords import KeywordMatcher
+
+LINES = [
+    "ddia ch 3 pages 69-110 - lsm trees and sstables",
+    "ai engineering chapter 2 - evals are harder than training",
+    "read a blog post about postgres vacuum on the train",
+    "finished the last chapter of the book everyone keeps recommending",
+]
+
+
+def padded_aliases(extra_books: int) -> dict:
+    aliases = load_book_aliases()
+    for i in range(extra_books):
+        key = f"Book_{i}"
+        for alias in (f"book {i}", f"b{i}x", f"the {i}th volume", f"series {i} part one"):
+            aliases[alias] = key
+    return aliases
+
+
+def loop_first(aliases: dict, line: str):
+    """parse_reading's alias lookup before the matcher."""
+    for alias, book_key in aliases.items():
+        if alias in line:
+            return book_key
+    return None
+
+
+def per_line(fn, budget: float = 1.0) -> float:
+    """Mean seconds per line over LINES."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for line in LINES:
+            fn(line)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > budget:
+            return elapsed / (runs * len(LINES))
+
+
+if __name__ == "__main__":
+    counts = [0, 25, 100, 400]
+    for arg in sys.argv[1:]:
+        if arg.startswith("--books="):
+            counts = [int(x) for x in arg.split("=", 1)[1].split(",")]
+
+    print(f"{'aliases':>8} {'loop':>10} {'matcher':>10} {'speedup':>8}")
+    for extra in counts:
+        aliases = padded_aliases(extra)
+        matcher = KeywordMatcher(aliases.items())
+        for line in LINES:
+            assert loop_first(aliases, line) == matcher.first(line)
+        old = per_line(lambda line: loop_first(aliases, line))
+        new = per_line(matcher.first)
+        print(f"{len(aliases):>8} {old * 1e6:>8.2f}us {new * 1e6:>8.2f}us {old / new:>7.1f}x")
@@ -0,0 +1,99 @@
+"""
+Microbenchmark: distinct pages read and chapter completion per book.
+
+Compares the old page sets (every pages range expanded into one int per
+page, and a set built per configured chapter for an issubset check)
+against IntervalSet. Readings are generated for a book of --pages pages
+in 30-page sittings, reading it through --rereads times, with every other
+pass skipping a stretch so coverage has gaps.
+
+Usage:
+    python bench_page_coverage.py [--pages=600] [--rereads=1,5,20]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from intervals import IntervalSet
+
+CHAPTER_PAGES = 25
+
+
+def readings(pages: int, rereads: int) -> list[tuple[int, int]]:
+    rng = random.Random(0)
+    ranges = []
+    for n in range(rereads):
+        page = 1
+        while page <= pages:
+            length = rng.randint(10, 40)
+            if n % 2 == 0 or rng.random() > 0.2:
+                ranges.append((page, min(pages, page + length - 1)))
+            page += length
+    return ranges
+
+
+def chapters(pages: int) -> dict:
+    return {
+        str(i + 1): {"pages": [start, min(pages, start + CHAPTER_PAGES - 1)]}
+        for i, start in enumerate(range(1, pages + 1, CHAPTER_PAGES))
+    }
+
+
+def with_sets(ranges: list, config: dict) -> tuple[int, list]:
+    """compute_reading_stats before IntervalSet."""
+    pages_read_set = set()
+    for start, end in ranges:
+        for p in range(start, end + 1):
+            pages_read_set.add(p)
+    completed = []
+    for ch_num, ch_config in config.items():
+        ch_pages = ch_config["pages"]
+        if set(range(ch_pages[0], ch_pages[1] + 1)).issubset(pages_read_set):
+            completed.append(int(ch_num))
+    return len(pages_read_set), completed
+
+
+def with_intervals(ranges: list, config: dict) -> tuple[int, list]:
+    pages_read = IntervalSet(ranges)
+    completed = [int(ch_num) for ch_num, ch_config in config.items() if pages_read.covers(*ch_config["pages"])]
+    return len(pages_read), completed
+
+
+def time_call(fn, *args, budget: float = 1.0) -> float:
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        fn(*args)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > budget:
+            return elapsed / runs
+
+
+def peak_bytes(fn, *args) -> int:
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    pages = 600
+    rereads = [1, 5, 20]
+    for arg in sys.argv[1:]:
+        if arg.startswith("--pages="):
+            pages = int(arg.split("=", 1)[1])
+        elif arg.startswith("--rereads="):
+            rereads = [int(x) for x in arg.split("=", 1)[1].split(",")]
+
+    config = chapters(pages)
+    print(f"{'rereads':>7} {'ranges':>7} {'sets':>10} {'intervals':>10} {'speedup':>8} {'set mem':>9} {'iv mem':>9}")
+    for count in rereads:
+        ranges = readings(pages, count)
+        assert with_sets(ranges, config) == with_intervals(ranges, config)
+        old = time_call(with_sets, ranges, config)
+        new = time_call(with_intervals, ranges, config)
+        print(f"{count:>7} {len(ranges):>7} {old * 1000:>8.2f}ms {new * 1000:>8.2f}ms {old / new:>7.1f}x "
+              f"{peak_bytes(with_sets, ranges, config) / 1024:>7.0f}KB {peak_bytes(with_intervals, ranges, config) / 1024:>7.0f}KB")
@@ -0,0 +1,155 @@
+"""
+Microbenchmark: classifying ## practice lines in the fallback parser.
+
+Compares the old chain (parse_leetcode, parse_sql, parse_system_design,
+parse_ml in turn, each lowercasing the line and running its own uncompiled
+searches) against classify_practice_line's single compiled match. Lines
+come from the practice sections of a journal week plus a synthetic mix of
+every kind, and the result is reported in lines per second.
+
+Usage:
+    python bench_practice_lines.py [journal/weeks/2026-W02.md] [--lines=20000]
+"""
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from fallback_parser import LIST_MARKER_RE, classify_practice_line
+from sections import index_journal
+
+DEFAULT_SAMPLE = Path(__file__).parent.parent / "weeks" / "2026-W02.md"
+
+SYNTHETIC = [
+    "Leetcode: Two Sum (easy) - hash map of complements",
+    "leetcode: LRU Cache, medium - dict + doubly linked list",
+    "SQL: window functions - RANK vs DENSE_RANK",
+    "System design: URL shortener (HLD) - base62 ids, cache hot keys",
+    "design: parking lot LLD - strategy pattern for pricing",
+    "ML: gradient descent - learning rate warmup",
+    "Read about machine learning evaluation - precision vs recall",
+    "Reviewed yesterday's notes",
+]
+
+
+def legacy_parse_leetcode(line: str) -> Optional[dict]:
+    line_lower = line.lower()
+    if "leetcode" not in line_lower:
+        return None
+    name_match = re.search(r'leetcode[:\s]+([^,\-]+)', line, re.IGNORECASE)
+    name = name_match.group(1).strip() if name_match else "Unknown"
+    difficulty = None
+    for d in ["easy", "medium", "hard"]:
+        if d in line_lower:
+            difficulty = d
+            break
+    insight = ""
+    dash_match = re.search(r'\s[-–]\s(.+)$', line)
+    if dash_match:
+        insight = dash_match.group(1).strip()
+    return {"name": name, "difficulty": difficulty, "insight": insight}
+
+
+def legacy_parse_sql(line: str) -> Optional[dict]:
+    line_lower = line.lower()
+    if "sql" not in line_lower:
+        return None
+    name_match = re.search(r'sql[:\s]+([^-–]+)', line, re.IGNORECASE)
+    name = name_match.group(1).strip() if name_match else line
+    insight = ""
+    dash_match = re.search(r'\s[-–]\s(.+)$', line)
+    if dash_match:
+        insight = dash_match.group(1).strip()
+    return {"name": name, "insight": insight}
+
+
+def legacy_parse_system_design(line: str) -> Optional[dict]:
+    line_lower = line.lower()
+    if "system design" not in line_lower and "design:" not in line_lower:
+        return None
+    name_match = re.search(r'(?:system\s+)?design[:\s]+([^-–]+)', line, re.IGNORECASE)
+    name = name_match.group(1).strip() if name_match else "Unknown"
+    design_type = "HLD" if "hld" in line_lower else ("LLD" if "lld" in line_lower else None)
+    insight = ""
+    dash_match = re.search(r'\s[-–]\s(.+)$', line)
+    if dash_match:
+        insight = dash_match.group(1).strip()
+    return {"name": name, "type": design_type, "insight": insight}
+
+
+def legacy_parse_ml(line: str) -> Optional[dict]:
+    line_lower = line.lower()
+    if "ml:" not in line_lower and "machine learning" not in line_lower:
+        return None
+    name_match = re.search(r'ml[:\s]+([^-–]+)', line, re.IGNORECASE)
+    name = name_match.group(1).strip() if name_match else line
+    insight = ""
+    dash_match = re.search(r'\s[-–]\s(.+)$', line)
+    if dash_match:
+        insight = dash_match.group(1).strip()
+    return {"name": name, "insight": insight}
+
+
+LEGACY_CHAIN = (
+    ("leetcode", legacy_parse_leetcode),
+    ("sql", legacy_parse_sql),
+    ("system_design", legacy_parse_system_design),
+    ("ml", legacy_parse_ml),
+)
+
+
+def legacy_classify(line: str) -> Optional[tuple[str, dict]]:
+    """The old per-line loop in parse_day_section."""
+    line = re.sub(r'^[-*]\s*', '', line)
+    for kind, parse in LEGACY_CHAIN:
+        record = parse(line)
+        if record:
+            return kind, record
+    return None
+
+
+def compiled_classify(line: str) -> Optional[tuple[str, dict]]:
+    return classify_practice_line(LIST_MARKER_RE.sub('', line))
+
+
+def practice_lines(path: Path) -> list[str]:
+    index = index_journal(path.read_text(encoding="utf-8-sig"))
+    lines = []
+    for day in index.days:
+        practice = index.subsections(day).get("practice", "")
+        lines.extend(line.strip() for line in practice.split("\n") if line.strip())
+    return lines
+
+
+def lines_per_second(classify, lines: list[str], budget: float = 2.0) -> float:
+    passes = 0
+    start = time.perf_counter()
+    while True:
+        for line in lines:
+            classify(line)
+        passes += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > budget:
+            return passes * len(lines) / elapsed
+
+
+if __name__ == "__main__":
+    sample = DEFAULT_SAMPLE
+    count = 20000
+    for arg in sys.argv[1:]:
+        if arg.startswith("--lines="):
+            count = int(arg.split("=", 1)[1])
+        else:
+            sample = Path(arg)
+
+    corpus = practice_lines(sample) + SYNTHETIC
+    lines = (corpus * (count // len(corpus) + 1))[:count]
+
+    mismatches = sum(1 for line in corpus if legacy_classify(line) != compiled_classify(line))
+    print(f"{len(corpus)} distinct lines, {mismatches} classified differently")
+
+    old = lines_per_second(legacy_classify, lines)
+    new = lines_per_second(compiled_classify, lines)
+    print(f"{'chained searches':<18} {old:>12,.0f} lines/s")
+    print(f"{'compiled classify':<18} {new:>12,.0f} lines/s  ({new / old:.1f}x)")
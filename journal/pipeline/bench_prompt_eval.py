@@ -0,0 +1,87 @@
+"""
+Compare Ollama prompt-eval time for day prompts with and without the shared prefix.
+
+"inline" is the old layout: instructions, then the day text, then the schema,
+all in one prompt, so nothing before the day text is shared between calls.
+"shared" is the current layout: instructions + schema as a stable system
+prompt (SYSTEM_PROMPTS["day"]) and only the day text in the prompt.
+
+Usage:
+    python bench_prompt_eval.py [week file] [--model=mistral]
+"""
+import re
+import sys
+from pathlib import Path
+
+import llm_cache
+from ollama_client import generate, warm_up
+from parser import DAY_SCHEMA, SYSTEM_PROMPTS, get_date_for_day, get_day_prompt, split_journal
+
+# Only the prompt is of interest - generate a single token
+BENCH_OPTIONS = {"num_predict": 1, "temperature": 0.1}
+
+
+def inline_day_prompt(day_text: str, date_str: str, day_name: str) -> str:
+    """The day prompt as it was before the shared-prefix layout."""
+    return f'''Extract JSON from this journal day. Return ONLY valid JSON, no explanation.
+
+Date: {date_str} ({day_name})
+
+TEXT:
+{day_text}
+
+Return this exact structure:
+{DAY_SCHEMA}'''
+
+
+def run_layout(name: str, days: list[tuple], model: str) -> list[float]:
+    """Send every day prompt in one layout and print per-call prompt-eval stats."""
+    print(f"\n{name}:")
+    durations = []
+    for day_name, date_str, text in days:
+        if name == "inline":
+            result = generate(inline_day_prompt(text, date_str, day_name), model, BENCH_OPTIONS)
+        else:
+            result = generate(get_day_prompt(text, date_str, day_name), model, BENCH_OPTIONS,
+                              system=SYSTEM_PROMPTS["day"])
+        if result is None:
+            print(f"  {day_name}: no response")
+            continue
+        seconds = result.get("prompt_eval_duration", 0) / 1e9
+        durations.append(seconds)
+        print(f"  {day_name}: {result.get('prompt_eval_count', 0)} tokens evaluated in {seconds * 1000:.0f}ms")
+    return durations
+
+
+if __name__ == "__main__":
+    filepath = Path(__file__).parent.parent / "weeks" / "2026-W02.md"
+    model = "mistral"
+    for arg in sys.argv[1:]:
+        if arg.startswith("--model="):
+            model = arg.split("=", 1)[1]
+        elif not arg.startswith("-"):
+            filepath = Path(arg)
+
+    match = re.match(r'(\d{4})-W(\d{2})', filepath.name)
+    if not match:
+        sys.exit(f"Invalid week filename: {filepath.name}")
+    year, week = int(match.group(1)), int(match.group(2))
+
+    sections = split_journal(filepath.read_text(encoding="utf-8"))
+    days = [
+        (day_name, get_date_for_day(day_name, year, week), text)
+        for day_name, text in sections["days"].items() if text.strip()
+    ]
+
+    llm_cache.configure(enabled=False)
+    if warm_up(model) is None:
+        sys.exit("Ollama is not responding")
+
+    print(f"Prompt eval for {len(days)} day prompts from {filepath.name} ({model})")
+    results = {name: run_layout(name, days, model) for name in ("inline", "shared")}
+
+    print()
+    for name, durations in results.items():
+        if durations:
+            mean = sum(durations) / len(durations)
+            print(f"{name:>6}: mean {mean * 1000:.0f}ms/call, total {sum(durations):.2f}s")
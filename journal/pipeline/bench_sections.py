@@ -0,0 +1,91 @@
+"""
+Microbenchmark: locating journal sections.
+
+Compares the old regex sectioning (split_journal's DOTALL day/goals/review
+searches, and the fallback parser's re.split plus one search per ##
+subsection per day) against a single SectionIndex pass. The input is a
+sample week repeated to build archives of growing size.
+
+Usage:
+    python bench_sections.py [journal/weeks/2026-W02.md] [--weeks=1,13,52]
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+from sections import index_journal
+
+SUBSECTIONS = ("practice", "building", "reading", "exploring", "notes")
+DEFAULT_SAMPLE = Path(__file__).parent.parent / "weeks" / "2026-W02.md"
+
+
+def legacy_split_journal(markdown: str) -> dict:
+    """split_journal as it was before the section index."""
+    sections = {"goals": "", "days": {}, "review": ""}
+    goals_match = re.search(r'##\s*goals?\s*\n(.*?)(?=\n---|\n#\s+\w+day)', markdown, re.DOTALL | re.IGNORECASE)
+    if goals_match:
+        sections["goals"] = goals_match.group(1).strip()
+    day_pattern = r'#\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(\w+)\s+(\d+)(.*?)(?=\n#\s+\w+day|\n##\s*week-review|$)'
+    for match in re.finditer(day_pattern, markdown, re.DOTALL | re.IGNORECASE):
+        sections["days"][match.group(1)] = match.group(4).strip()
+    review_match = re.search(r'##\s*week-review\s*\n(.*?)(?=\n---\s*$|$)', markdown, re.DOTALL | re.IGNORECASE)
+    if review_match:
+        sections["review"] = review_match.group(1).strip()
+    return sections
+
+
+def legacy_fallback_sections(markdown: str) -> list:
+    """The fallback parser's old sectioning: re.split on # headings, then a search per subsection."""
+    found = []
+    for section in re.split(r'^#\s+', markdown, flags=re.MULTILINE):
+        section = section.strip()
+        if not section:
+            continue
+        if section.startswith("Week of"):
+            re.search(r'##\s*goals?\s*\n(.*?)(?=\n---|\n##|$)', section, re.DOTALL | re.IGNORECASE)
+        if re.match(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(\w+)\s+(\d+)', section, re.IGNORECASE):
+            found.append({
+                name: re.search(rf'##\s*{name}\s*\n(.*?)(?=\n##|$)', section, re.DOTALL | re.IGNORECASE)
+                for name in SUBSECTIONS
+            })
+    return found
+
+
+def indexed_sections(markdown: str) -> list:
+    index = index_journal(markdown)
+    index.slice(index.goals)
+    index.slice(index.review)
+    return [index.subsections(day) for day in index.days]
+
+
+def time_call(fn, text: str, budget: float = 2.0) -> float:
+    """Mean seconds per call, repeating until the budget or 50 runs."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        fn(text)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed > budget or runs >= 50:
+            return elapsed / runs
+
+
+if __name__ == "__main__":
+    sample = DEFAULT_SAMPLE
+    weeks = [1, 13, 52]
+    for arg in sys.argv[1:]:
+        if arg.startswith("--weeks="):
+            weeks = [int(x) for x in arg.split("=", 1)[1].split(",")]
+        else:
+            sample = Path(arg)
+
+    week_text = sample.read_text(encoding="utf-8-sig")
+    print(f"{'weeks':>5} {'chars':>9} {'split_journal':>14} {'fallback':>10} {'index':>10} {'speedup':>8}")
+    for count in weeks:
+        text = "\n".join([week_text] * count)
+        split = time_call(legacy_split_journal, text)
+        fallback = time_call(legacy_fallback_sections, text)
+        indexed = time_call(indexed_sections, text)
+        print(f"{count:>5} {len(text):>9} {split * 1000:>12.2f}ms {fallback * 1000:>8.2f}ms "
+              f"{indexed * 1000:>8.2f}ms {(split + fallback) / indexed:>7.1f}x")
@@ -0,0 +1,125 @@
+"""
+Ordinal date index for streaks and week lookups.
+Journal dates are "YYYY-MM-DD" strings. DateIndex parses each one once per
+run into a day ordinal, and a set of active days is kept as runs of
+consecutive ordinals, so streak questions are binary searches instead of
+walks over every date. WeekIndex maps each ISO week to the dates in it.
+"""
+
+from bisect import bisect_left
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+try:
+    from .intervals import IntervalSet
+except ImportError:
+    from intervals import IntervalSet
+
+
+class DateIndex:
+    """
+    Cache from journal date strings to day ordinals and ISO weeks.
+
+    Strings that aren't "%Y-%m-%d" dates map to None, which callers skip,
+    as the strptime loops this replaces did.
+    """
+
+    def __init__(self):
+        self._ordinals = {}     # "2025-01-06" -> 739257, or None
+        self._weeks = {}        # ordinal -> (ISO year, ISO week)
+
+    def ordinal(self, day: str) -> Optional[int]:
+        """Day ordinal of a date string, or None if it isn't a date."""
+        try:
+            return self._ordinals[day]
+        except KeyError:
+            pass
+        try:
+            ordinal = datetime.strptime(day, "%Y-%m-%d").toordinal()
+        except (ValueError, TypeError):
+            ordinal = None
+        self._ordinals[day] = ordinal
+        return ordinal
+
+    def iso_week(self, day: str) -> Optional[tuple[int, int]]:
+        """(ISO year, ISO week) of a date string, or None if it isn't a date."""
+        ordinal = self.ordinal(day)
+        if ordinal is None:
+            return None
+        week = self._weeks.get(ordinal)
+        if week is None:
+            week = self._weeks[ordinal] = tuple(date.fromordinal(ordinal).isocalendar()[:2])
+        return week
+
+    def runs(self, days: Iterable[str]) -> IntervalSet:
+        """Runs of consecutive days among the given date strings."""
+        runs = IntervalSet()
+        for day in days:
+            ordinal = self.ordinal(day)
+            if ordinal is not None:
+                runs.add(ordinal, ordinal)
+        return runs
+
+
+# Shared by stats and topics, so a date is parsed once per run
+DATES = DateIndex()
+
+
+def current_streak(runs: IntervalSet, as_of: int) -> int:
+    """
+    Consecutive active days up to and including the day ordinal as_of.
+    A run that ended the day before still counts, so a streak isn't broken
+    before the day's entry has been written.
+    """
+    run = runs.interval_at(as_of) or runs.interval_at(as_of - 1)
+    if run is None:
+        return 0
+    return min(run[1], as_of) - run[0] + 1
+
+
+def streaks(runs: IntervalSet, as_of: Optional[int] = None) -> tuple[int, int]:
+    """(current streak as of the day ordinal as_of, default today; longest streak)."""
+    if as_of is None:
+        as_of = date.today().toordinal()
+    return current_streak(runs, as_of), runs.longest
+
+
+class WeekIndex:
+    """
+    ISO week -> sorted dates of the entries in it.
+
+    Kept in step with entries as days are added and removed, so finding a
+    week's days is one dict lookup instead of a pass over every entry.
+    Weeks are keyed by (ISO year, ISO week), as DateIndex.iso_week gives
+    them; strings that aren't dates belong to no week.
+    """
+
+    def __init__(self, dates: Iterable[str] = ()):
+        self._weeks = {}        # (year, week) -> sorted [(ordinal, date string)]
+        for day in dates:
+            self.add(day)
+
+    def add(self, day: str):
+        ordinal = DATES.ordinal(day)
+        if ordinal is None:
+            return
+        days = self._weeks.setdefault(DATES.iso_week(day), [])
+        i = bisect_left(days, (ordinal, day))
+        if i == len(days) or days[i] != (ordinal, day):
+            days.insert(i, (ordinal, day))
+
+    def discard(self, day: str):
+        ordinal = DATES.ordinal(day)
+        if ordinal is None:
+            return
+        week = DATES.iso_week(day)
+        days = self._weeks.get(week, [])
+        i = bisect_left(days, (ordinal, day))
+        if i < len(days) and days[i] == (ordinal, day):
+            del days[i]
+            if not days:
+                del self._weeks[week]
+
+    def dates(self, year: int, week: int) -> list[str]:
+        """The week's dates in date order (empty if it has none)."""
+        return [day for _, day in self._weeks.get((year, week), ())]
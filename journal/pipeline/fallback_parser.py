@@ -3,10 +3,30 @@ Fallback regex-based parser for testing without Ollama.
 This provides a deterministic parser that works offline.
 """
 
+import json
 import re
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional
 
+try:
+    from .keywords import KeywordMatcher, grouped_keywords
+    from .sections import find_subsections, index_journal
+except ImportError:
+    from keywords import KeywordMatcher, grouped_keywords
+    from sections import find_subsections, index_journal
+
+BOOKS_CONFIG = Path(__file__).parent.parent / "config" / "books.json"
+
+# Day record field filled from each ## subsection
+SUBSECTION_FIELDS = {
+    "practice": "practice",
+    "building": "building",
+    "reading": "reading",
+    "exploring": "exploring",
+    "notes": "notes",
+}
+
 
 def parse_week_identifier(filename: str) -> tuple[int, int]:
     """Extract year and week number from filename like '2025-W02.md'."""
@@ -33,95 +53,89 @@ def day_name_to_offset(day_name: str) -> int:
     return days.get(day_name.lower(), 0)
 
 
-def parse_leetcode(line: str) -> Optional[dict]:
-    """Parse a leetcode practice line."""
+# Keywords that mark a practice line's kind, in priority order: a line
+# mentioning both leetcode and sql is a leetcode line
+PRACTICE_KEYWORDS = {
+    "leetcode": ("leetcode",),
+    "sql": ("sql",),
+    "system_design": ("system design", "design:"),
+    "ml": ("ml:", "machine learning"),
+}
+# Every keyword in one alternation; the named group that matched is the kind
+PRACTICE_KEYWORD_RE = re.compile("|".join(
+    f"(?P<{kind}>{'|'.join(re.escape(k) for k in keywords)})"
+    for kind, keywords in PRACTICE_KEYWORDS.items()
+))
+# "<keyword>: name" for each kind
+PRACTICE_NAME_RES = {
+    "leetcode": re.compile(r'leetcode[:\s]+([^,\-]+)', re.IGNORECASE),
+    "sql": re.compile(r'sql[:\s]+([^-–]+)', re.IGNORECASE),
+    "system_design": re.compile(r'(?:system\s+)?design[:\s]+([^-–]+)', re.IGNORECASE),
+    "ml": re.compile(r'ml[:\s]+([^-–]+)', re.IGNORECASE),
+}
+
+# "... - insight" at the end of a line
+INSIGHT_RE = re.compile(r'\s[-–]\s(.+)$')
+LIST_MARKER_RE = re.compile(r'^[-*]\s*')
+CHAPTER_RE = re.compile(r'ch(?:apter)?\.?\s*(\d+)', re.IGNORECASE)
+PAGES_RE = re.compile(r'pages?\s+(\d+)\s*[-–to]+\s*(\d+)', re.IGNORECASE)
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def parse_insight(line: str) -> str:
+    """Text after a " - " separator, or ""."""
+    dash_match = INSIGHT_RE.search(line)
+    return dash_match.group(1).strip() if dash_match else ""
+
+
+def classify_practice_line(line: str) -> Optional[tuple[str, dict]]:
+    """
+    Classify and parse a practice line.
+    Returns (kind, record) with kind one of leetcode, sql, system_design,
+    ml - or None if the line isn't practice.
+    """
     line_lower = line.lower()
-    if "leetcode" not in line_lower:
+    match = PRACTICE_KEYWORD_RE.search(line_lower)
+    if not match:
         return None
 
-    # Extract problem name - usually after "leetcode:"
-    name_match = re.search(r'leetcode[:\s]+([^,\-]+)', line, re.IGNORECASE)
-    name = name_match.group(1).strip() if name_match else "Unknown"
-
-    # Extract difficulty
-    difficulty = None
-    for d in ["easy", "medium", "hard"]:
-        if d in line_lower:
-            difficulty = d
+    # The first keyword found may be outranked by one later in the line
+    kind = match.lastgroup
+    for higher in PRACTICE_KEYWORDS:
+        if higher == kind:
+            break
+        if any(keyword in line_lower for keyword in PRACTICE_KEYWORDS[higher]):
+            kind = higher
             break
 
-    # Extract insight - usually after difficulty or after dash
-    insight = ""
-    dash_match = re.search(r'\s[-–]\s(.+)$', line)
-    if dash_match:
-        insight = dash_match.group(1).strip()
-
-    return {"name": name, "difficulty": difficulty, "insight": insight}
-
-
-def parse_sql(line: str) -> Optional[dict]:
-    """Parse a SQL practice line."""
-    line_lower = line.lower()
-    if "sql" not in line_lower:
-        return None
-
-    # Extract topic - usually after "sql:"
-    name_match = re.search(r'sql[:\s]+([^-–]+)', line, re.IGNORECASE)
-    name = name_match.group(1).strip() if name_match else line
-
-    insight = ""
-    dash_match = re.search(r'\s[-–]\s(.+)$', line)
-    if dash_match:
-        insight = dash_match.group(1).strip()
-
-    return {"name": name, "insight": insight}
-
-
-def parse_system_design(line: str) -> Optional[dict]:
-    """Parse a system design practice line."""
-    line_lower = line.lower()
-    if "system design" not in line_lower and "design:" not in line_lower:
-        return None
-
-    name_match = re.search(r'(?:system\s+)?design[:\s]+([^-–]+)', line, re.IGNORECASE)
-    name = name_match.group(1).strip() if name_match else "Unknown"
-
-    design_type = "HLD" if "hld" in line_lower else ("LLD" if "lld" in line_lower else None)
-
-    insight = ""
-    dash_match = re.search(r'\s[-–]\s(.+)$', line)
-    if dash_match:
-        insight = dash_match.group(1).strip()
-
-    return {"name": name, "type": design_type, "insight": insight}
+    name_match = PRACTICE_NAME_RES[kind].search(line)
+    insight = parse_insight(line)
 
+    if kind == "leetcode":
+        name = name_match.group(1).strip() if name_match else "Unknown"
+        difficulty = None
+        for d in DIFFICULTIES:
+            if d in line_lower:
+                difficulty = d
+                break
+        return kind, {"name": name, "difficulty": difficulty, "insight": insight}
 
-def parse_ml(line: str) -> Optional[dict]:
-    """Parse an ML practice line."""
-    line_lower = line.lower()
-    if "ml:" not in line_lower and "machine learning" not in line_lower:
-        return None
+    if kind == "system_design":
+        name = name_match.group(1).strip() if name_match else "Unknown"
+        design_type = "HLD" if "hld" in line_lower else ("LLD" if "lld" in line_lower else None)
+        return kind, {"name": name, "type": design_type, "insight": insight}
 
-    name_match = re.search(r'ml[:\s]+([^-–]+)', line, re.IGNORECASE)
+    # sql, ml
     name = name_match.group(1).strip() if name_match else line
-
-    insight = ""
-    dash_match = re.search(r'\s[-–]\s(.+)$', line)
-    if dash_match:
-        insight = dash_match.group(1).strip()
-
-    return {"name": name, "insight": insight}
+    return kind, {"name": name, "insight": insight}
 
 
 def load_book_aliases() -> dict:
     """Load book aliases from config."""
-    import json
-    from pathlib import Path
-    config_path = Path(__file__).parent.parent / "config" / "books.json"
-
     aliases = {}
-    if config_path.exists():
-        books = json.loads(config_path.read_text())
+    if BOOKS_CONFIG.exists():
+        books = json.loads(BOOKS_CONFIG.read_text())
         for key, book in books.items():
             # Add the key itself
             aliases[key.lower()] = key
@@ -146,46 +160,59 @@ def load_book_aliases() -> dict:
     return aliases
 
 
-# Cache book aliases
+# Cache book aliases and their matcher, rebuilt when books.json changes
 _BOOK_ALIASES = None
+_BOOK_MATCHER = None
+_BOOKS_MTIME = None
 
-def get_book_aliases() -> dict:
-    global _BOOK_ALIASES
-    if _BOOK_ALIASES is None:
+
+def _books_mtime() -> Optional[int]:
+    try:
+        return BOOKS_CONFIG.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_book_matcher() -> KeywordMatcher:
+    """Matcher from book aliases to book keys (the first alias in config order wins)."""
+    global _BOOK_ALIASES, _BOOK_MATCHER, _BOOKS_MTIME
+    mtime = _books_mtime()
+    if _BOOK_MATCHER is None or mtime != _BOOKS_MTIME:
         _BOOK_ALIASES = load_book_aliases()
+        _BOOK_MATCHER = KeywordMatcher(_BOOK_ALIASES.items())
+        _BOOKS_MTIME = mtime
+    return _BOOK_MATCHER
+
+
+def get_book_aliases() -> dict:
+    get_book_matcher()
     return _BOOK_ALIASES
 
 
-def parse_reading(line: str) -> Optional[dict]:
-    """Parse a reading entry line."""
+def parse_reading(line: str, books: Optional[KeywordMatcher] = None) -> Optional[dict]:
+    """
+    Parse a reading entry line.
+    books is the alias matcher to use (get_book_matcher() when not given).
+    """
     result = {"book": None, "chapter": None, "pages": None, "insight": ""}
 
-    line_lower = line.lower()
-    aliases = get_book_aliases()
-
     # Look for book names/aliases
-    for alias, book_key in aliases.items():
-        if alias in line_lower:
-            result["book"] = book_key
-            break
+    result["book"] = (books or get_book_matcher()).first(line.lower())
 
     if not result["book"]:
         return None
 
     # Extract chapter
-    ch_match = re.search(r'ch(?:apter)?\.?\s*(\d+)', line, re.IGNORECASE)
+    ch_match = CHAPTER_RE.search(line)
     if ch_match:
         result["chapter"] = int(ch_match.group(1))
 
     # Extract pages
-    pages_match = re.search(r'pages?\s+(\d+)\s*[-–to]+\s*(\d+)', line, re.IGNORECASE)
+    pages_match = PAGES_RE.search(line)
     if pages_match:
         result["pages"] = [int(pages_match.group(1)), int(pages_match.group(2))]
 
-    # Extract insight
-    dash_match = re.search(r'\s[-–]\s(.+)$', line)
-    if dash_match:
-        result["insight"] = dash_match.group(1).strip()
+    result["insight"] = parse_insight(line)
 
     return result
 
@@ -201,7 +228,7 @@ def parse_building(text: str) -> list[dict]:
             continue
 
         # Remove list marker
-        line = re.sub(r'^[-*]\s*', '', line)
+        line = LIST_MARKER_RE.sub('', line)
 
         # Try to split on dash to get project name and work
         parts = re.split(r'\s[-–]\s', line, maxsplit=1)
@@ -213,34 +240,27 @@ def parse_building(text: str) -> list[dict]:
     return results
 
 
+# Topic detection keywords
+EXPLORING_TOPICS = {
+    "astronomy": ["space", "star", "planet", "galaxy", "telescope", "gravitational", "cosmos", "universe", "moon", "sun"],
+    "philosophy": ["stoic", "philosophy", "ethics", "meaning", "existence", "consciousness", "moral"],
+    "history": ["history", "ancient", "war", "civilization", "century", "era"],
+    "music": ["music", "song", "band", "album", "concert", "instrument"],
+    "technology": ["computer", "tech", "software", "hardware", "programming", "ai", "robot"],
+    "science": ["physics", "chemistry", "biology", "experiment", "research", "scientific"],
+    "art": ["art", "painting", "sculpture", "museum", "artist"],
+    "psychology": ["psychology", "mind", "behavior", "cognitive", "mental"]
+}
+# The first topic (in the order above) with a keyword in the text wins
+EXPLORING_MATCHER = KeywordMatcher(grouped_keywords(EXPLORING_TOPICS))
+
+
 def parse_exploring(text: str) -> list[dict]:
     """Parse exploring section text."""
     results = []
 
-    # Topic detection keywords
-    topic_keywords = {
-        "astronomy": ["space", "star", "planet", "galaxy", "telescope", "gravitational", "cosmos", "universe", "moon", "sun"],
-        "philosophy": ["stoic", "philosophy", "ethics", "meaning", "existence", "consciousness", "moral"],
-        "history": ["history", "ancient", "war", "civilization", "century", "era"],
-        "music": ["music", "song", "band", "album", "concert", "instrument"],
-        "technology": ["computer", "tech", "software", "hardware", "programming", "ai", "robot"],
-        "science": ["physics", "chemistry", "biology", "experiment", "research", "scientific"],
-        "art": ["art", "painting", "sculpture", "museum", "artist"],
-        "psychology": ["psychology", "mind", "behavior", "cognitive", "mental"]
-    }
-
     content = text.strip()
-    text_lower = content.lower()
-
-    # Detect topic
-    detected_topic = "misc"
-    for topic, keywords in topic_keywords.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                detected_topic = topic
-                break
-        if detected_topic != "misc":
-            break
+    detected_topic = EXPLORING_MATCHER.first(content.lower()) or "misc"
 
     if content:
         results.append({"topic": detected_topic, "content": content})
@@ -248,6 +268,188 @@ def parse_exploring(text: str) -> list[dict]:
     return results
 
 
+def parse_goals_text(goals_text: str) -> list[str]:
+    """Parse the bullet list under a ## goals header."""
+    goals = []
+    for line in goals_text.strip().split('\n'):
+        line = line.strip()
+        if line and line.startswith('-'):
+            goals.append(line[1:].strip())
+    return goals
+
+
+def parse_day_section(section: str, day_name: str, subsections: Optional[dict] = None) -> dict:
+    """
+    Parse one day's text (its ## practice, ## building, ... subsections).
+    The record is tagged with "parser": "fallback".
+
+    subsections maps subsection names to their text, as found by the
+    section tokenizer; it's built from section when not given.
+    """
+    if subsections is None:
+        subsections = find_subsections(section)
+
+    day_data = {
+        "day": day_name.capitalize(),
+        "practice": {"leetcode": [], "sql": [], "system_design": [], "ml": []},
+        "building": [],
+        "reading": [],
+        "exploring": [],
+        "notes": None,
+        "parser": "fallback"
+    }
+
+    # Parse practice section
+    practice_text = subsections.get("practice")
+    if practice_text is not None:
+        for line in practice_text.strip().split('\n'):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            classified = classify_practice_line(LIST_MARKER_RE.sub('', line))
+            if classified:
+                kind, record = classified
+                day_data["practice"][kind].append(record)
+
+    # Parse building section
+    building_text = subsections.get("building")
+    if building_text is not None:
+        day_data["building"] = parse_building(building_text)
+
+    # Parse reading section
+    reading_text = subsections.get("reading")
+    if reading_text is not None:
+        books = get_book_matcher()
+        for line in reading_text.strip().split('\n'):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            reading = parse_reading(LIST_MARKER_RE.sub('', line), books)
+            if reading:
+                day_data["reading"].append(reading)
+
+    # Parse exploring section
+    exploring_text = subsections.get("exploring")
+    if exploring_text is not None:
+        day_data["exploring"] = parse_exploring(exploring_text)
+
+    # Parse notes section
+    notes_text = subsections.get("notes")
+    if notes_text is not None:
+        notes_text = notes_text.strip()
+        # Remove trailing separators
+        notes_text = re.sub(r'\n*---\s*$', '', notes_text).strip()
+        day_data["notes"] = notes_text if notes_text else None
+
+    return day_data
+
+
+# Subsections parse_day_section understands
+KNOWN_SUBSECTIONS = ("practice", "building", "reading", "exploring", "notes")
+
+
+def score_day_confidence(section: str, day_data: dict) -> float:
+    """
+    Estimate how completely the regex parser understood a day's text (0.0-1.0).
+
+    Counts content lines the parser couldn't account for: practice/reading
+    lines that produced no record, records with an "Unknown" name, and
+    lines outside any known ## subsection. Building, exploring and notes
+    are free text, so their lines count as understood as long as the
+    section parsed to something; one with content that came out empty
+    (e.g. a "## building log" heading the parser doesn't know) counts as
+    unrecognized. Expects the day's body (the text after its
+    "# Monday, Jan 6" header).
+    """
+    lines_in = dict.fromkeys(KNOWN_SUBSECTIONS, 0)
+    total = 0
+    unrecognized = 0
+    current = None
+
+    for line in section.split('\n'):
+        line = line.strip()
+        header = re.match(r'#+\s*([\w-]+)', line)
+        if header:
+            current = header.group(1).lower()
+            continue
+        if not line or line == '---' or line in ('-', '*'):
+            continue
+
+        total += 1
+        if current in lines_in:
+            lines_in[current] += 1
+        else:
+            unrecognized += 1
+
+    if total == 0:
+        return 1.0
+
+    practice_records = [item for items in day_data["practice"].values() for item in items]
+    unrecognized += max(0, lines_in["practice"] - len(practice_records))
+    unrecognized += max(0, lines_in["reading"] - len(day_data["reading"]))
+    unrecognized += sum(1 for item in practice_records if item.get("name") == "Unknown")
+    for name in ("building", "exploring", "notes"):
+        if lines_in[name] and not day_data[name]:
+            unrecognized += lines_in[name]
+
+    return max(0.0, 1 - unrecognized / total)
+
+
+def parse_review_section(review_text: str, weekly_goals: list[str]) -> dict:
+    """Parse the week-review section, inferring completed goals from its summary."""
+    review = {}
+
+    # Extract summary
+    summary_match = re.search(r'Goals?\s+hit[:\s]+(.+?)(?:\n|$)', review_text, re.IGNORECASE)
+    if summary_match:
+        review["summary"] = summary_match.group(1).strip()
+
+    # Extract highlight
+    highlight_match = re.search(r'Highlight[:\s]+(.+?)(?:\n|$)', review_text, re.IGNORECASE)
+    if highlight_match:
+        review["highlight"] = highlight_match.group(1).strip()
+
+    # Extract next week
+    next_match = re.search(r'Next\s+week[:\s]+(.+?)(?:\n|$)', review_text, re.IGNORECASE)
+    if next_match:
+        review["next_week"] = next_match.group(1).strip()
+
+    # Goals completed - try to infer from summary and goals
+    goals_completed = []
+    summary = review.get("summary", "")
+
+    # Look for "X/Y" pattern to determine how many were completed
+    ratio_match = re.search(r'(\d+)/(\d+)', summary)
+    if ratio_match and weekly_goals:
+        completed_count = int(ratio_match.group(1))
+        # Try to identify which goals were NOT completed based on text
+        # Look for patterns like "didn't finish DDIA ch4" or "didn't complete X"
+        uncompleted_terms = []
+        didnt_match = re.search(r"didn'?t\s+(?:finish|complete|do)\s+(.+?)(?:,|\s*-|$)", summary, re.IGNORECASE)
+        if didnt_match:
+            uncompleted_text = didnt_match.group(1).lower().strip()
+            # Extract key terms (DDIA, ch4, chapter 4, etc.)
+            uncompleted_terms = re.findall(r'\b\w+\b', uncompleted_text)
+
+        # Mark goals as completed unless they match uncompleted terms
+        for goal in weekly_goals:
+            goal_lower = goal.lower()
+            # Check if goal contains any of the uncompleted terms
+            is_uncompleted = False
+            for term in uncompleted_terms:
+                if len(term) >= 3 and term in goal_lower:  # Only match terms 3+ chars
+                    is_uncompleted = True
+                    break
+            if not is_uncompleted:
+                goals_completed.append(goal)
+
+        # Limit to the completed count
+        goals_completed = goals_completed[:completed_count]
+
+    review["goals_completed"] = goals_completed
+    return review
+
+
 def parse_journal_fallback(markdown_text: str, week_filename: str) -> dict:
     """
     Parse journal markdown using regex patterns.
@@ -262,163 +464,95 @@ def parse_journal_fallback(markdown_text: str, week_filename: str) -> dict:
         "week_review": {}
     }
 
-    # Split into sections by day headers
-    sections = re.split(r'^#\s+', markdown_text, flags=re.MULTILINE)
+    index = index_journal(markdown_text)
+
+    if index.goals:
+        result["weekly_goals"].extend(parse_goals_text(index.slice(index.goals)))
+
+    for day in index.days:
+        day_name = day["name"]
+        offset = day_name_to_offset(day_name)
+        day_date = week_start + timedelta(days=offset)
+        date_str = day_date.strftime("%Y-%m-%d")
+
+        day_text = index.text[day["body_start"]:day["end"]]
+        result["days"][date_str] = parse_day_section(day_text, day_name, index.subsections(day))
+
+    if index.review:
+        result["week_review"] = parse_review_section(index.slice(index.review), result["weekly_goals"])
 
-    for section in sections:
-        section = section.strip()
-        if not section:
+    return result
+
+
+def patch_journal_fallback(
+    markdown_text: str,
+    week_filename: str,
+    changes: dict,
+    existing_entries: dict,
+    existing_week: Optional[dict] = None
+) -> dict:
+    """
+    Parse only what changed since the previous export of this week.
+
+    changes is diff_journals(previous, markdown_text). Unchanged days reuse
+    their existing entries. A day with only some subsections changed has
+    just those subsections re-parsed and patched into its existing
+    fallback record. New days, days whose existing record came from
+    another parser, and days with no existing entry are parsed in full.
+    Goals are reused from existing_week when unchanged. The result has
+    the same shape as parse_journal_fallback's.
+    """
+    year, week = parse_week_identifier(week_filename)
+    week_start = get_week_start_date(year, week)
+    existing_week = existing_week or {}
+
+    result = {
+        "weekly_goals": [],
+        "days": {},
+        "week_review": {}
+    }
+
+    index = index_journal(markdown_text)
+
+    if not changes["goals"] and "goals" in existing_week:
+        result["weekly_goals"] = list(existing_week["goals"])
+    elif index.goals:
+        result["weekly_goals"].extend(parse_goals_text(index.slice(index.goals)))
+
+    for day in index.days:
+        day_name = day["name"]
+        day_date = week_start + timedelta(days=day_name_to_offset(day_name))
+        date_str = day_date.strftime("%Y-%m-%d")
+        existing = existing_entries.get(date_str)
+        key = day_name.capitalize()
+
+        if existing is not None and key not in changes["days"]:
+            result["days"][date_str] = existing
             continue
 
-        # Check if this is the week header with goals
-        if section.startswith("Week of"):
-            goals_match = re.search(r'##\s*goals?\s*\n(.*?)(?=\n---|\n##|$)', section, re.DOTALL | re.IGNORECASE)
-            if goals_match:
-                goals_text = goals_match.group(1)
-                for line in goals_text.strip().split('\n'):
-                    line = line.strip()
-                    if line and line.startswith('-'):
-                        result["weekly_goals"].append(line[1:].strip())
-
-        # Check if this is a day section
-        day_match = re.match(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(\w+)\s+(\d+)', section, re.IGNORECASE)
-        if day_match:
-            day_name = day_match.group(1)
-            offset = day_name_to_offset(day_name)
-            day_date = week_start + timedelta(days=offset)
-            date_str = day_date.strftime("%Y-%m-%d")
-
-            day_data = {
-                "day": day_name.capitalize(),
-                "practice": {"leetcode": [], "sql": [], "system_design": [], "ml": []},
-                "building": [],
-                "reading": [],
-                "exploring": [],
-                "notes": None
-            }
-
-            # Parse practice section
-            practice_match = re.search(r'##\s*practice\s*\n(.*?)(?=\n##|$)', section, re.DOTALL | re.IGNORECASE)
-            if practice_match:
-                practice_text = practice_match.group(1)
-                for line in practice_text.strip().split('\n'):
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    line = re.sub(r'^[-*]\s*', '', line)
-
-                    lc = parse_leetcode(line)
-                    if lc:
-                        day_data["practice"]["leetcode"].append(lc)
-                        continue
-
-                    sql = parse_sql(line)
-                    if sql:
-                        day_data["practice"]["sql"].append(sql)
-                        continue
-
-                    sd = parse_system_design(line)
-                    if sd:
-                        day_data["practice"]["system_design"].append(sd)
-                        continue
-
-                    ml = parse_ml(line)
-                    if ml:
-                        day_data["practice"]["ml"].append(ml)
-
-            # Parse building section
-            building_match = re.search(r'##\s*building\s*\n(.*?)(?=\n##|$)', section, re.DOTALL | re.IGNORECASE)
-            if building_match:
-                day_data["building"] = parse_building(building_match.group(1))
-
-            # Parse reading section
-            reading_match = re.search(r'##\s*reading\s*\n(.*?)(?=\n##|$)', section, re.DOTALL | re.IGNORECASE)
-            if reading_match:
-                reading_text = reading_match.group(1)
-                for line in reading_text.strip().split('\n'):
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    line = re.sub(r'^[-*]\s*', '', line)
-                    reading = parse_reading(line)
-                    if reading:
-                        day_data["reading"].append(reading)
-
-            # Parse exploring section
-            exploring_match = re.search(r'##\s*exploring\s*\n(.*?)(?=\n##|$)', section, re.DOTALL | re.IGNORECASE)
-            if exploring_match:
-                day_data["exploring"] = parse_exploring(exploring_match.group(1))
-
-            # Parse notes section
-            notes_match = re.search(r'##\s*notes\s*\n(.*?)(?=\n##|$)', section, re.DOTALL | re.IGNORECASE)
-            if notes_match:
-                notes_text = notes_match.group(1).strip()
-                # Remove trailing separators
-                notes_text = re.sub(r'\n*---\s*$', '', notes_text).strip()
-                day_data["notes"] = notes_text if notes_text else None
-
-            result["days"][date_str] = day_data
-
-        # Check for week-review section
-        if "week-review" in section.lower():
-            review_text = section
-
-            # Extract summary
-            summary_match = re.search(r'Goals?\s+hit[:\s]+(.+?)(?:\n|$)', review_text, re.IGNORECASE)
-            if summary_match:
-                result["week_review"]["summary"] = summary_match.group(1).strip()
-
-            # Extract highlight
-            highlight_match = re.search(r'Highlight[:\s]+(.+?)(?:\n|$)', review_text, re.IGNORECASE)
-            if highlight_match:
-                result["week_review"]["highlight"] = highlight_match.group(1).strip()
-
-            # Extract next week
-            next_match = re.search(r'Next\s+week[:\s]+(.+?)(?:\n|$)', review_text, re.IGNORECASE)
-            if next_match:
-                result["week_review"]["next_week"] = next_match.group(1).strip()
-
-            # Goals completed - try to infer from summary and goals
-            goals_completed = []
-            summary = result["week_review"].get("summary", "")
-
-            # Look for "X/Y" pattern to determine how many were completed
-            ratio_match = re.search(r'(\d+)/(\d+)', summary)
-            if ratio_match and result["weekly_goals"]:
-                completed_count = int(ratio_match.group(1))
-                # Try to identify which goals were NOT completed based on text
-                # Look for patterns like "didn't finish DDIA ch4" or "didn't complete X"
-                uncompleted_terms = []
-                didnt_match = re.search(r"didn'?t\s+(?:finish|complete|do)\s+(.+?)(?:,|\s*-|$)", summary, re.IGNORECASE)
-                if didnt_match:
-                    uncompleted_text = didnt_match.group(1).lower().strip()
-                    # Extract key terms (DDIA, ch4, chapter 4, etc.)
-                    uncompleted_terms = re.findall(r'\b\w+\b', uncompleted_text)
-
-                # Mark goals as completed unless they match uncompleted terms
-                for goal in result["weekly_goals"]:
-                    goal_lower = goal.lower()
-                    # Check if goal contains any of the uncompleted terms
-                    is_uncompleted = False
-                    for term in uncompleted_terms:
-                        if len(term) >= 3 and term in goal_lower:  # Only match terms 3+ chars
-                            is_uncompleted = True
-                            break
-                    if not is_uncompleted:
-                        goals_completed.append(goal)
-
-                # Limit to the completed count
-                goals_completed = goals_completed[:completed_count]
-
-            result["week_review"]["goals_completed"] = goals_completed
+        day_text = index.text[day["body_start"]:day["end"]]
+        subsections = index.subsections(day)
+        changed = changes["days"].get(key)
+
+        if existing is None or changed is None or existing.get("parser") != "fallback":
+            result["days"][date_str] = parse_day_section(day_text, day_name, subsections)
+            continue
+
+        # Re-parse just the changed subsections; one that was removed parses to its empty default
+        fresh = parse_day_section(day_text, day_name, {name: subsections[name] for name in changed if name in subsections})
+        fields = {SUBSECTION_FIELDS[name] for name in changed if name in SUBSECTION_FIELDS}
+        result["days"][date_str] = {**existing, **{field: fresh[field] for field in fields}}
+
+    if index.review:
+        if not changes["review"] and not changes["goals"] and existing_week.get("week_review"):
+            result["week_review"] = existing_week["week_review"]
+        else:
+            result["week_review"] = parse_review_section(index.slice(index.review), result["weekly_goals"])
 
     return result
 
 
 if __name__ == "__main__":
-    import json
-    from pathlib import Path
-
     # Test with sample file
     sample_path = Path(__file__).parent.parent / "weeks" / "2025-W02.md"
     if sample_path.exists():
@@ -0,0 +1,233 @@
+"""
+Incremental JSON value scanning for model output.
+Tracks brace/bracket balance so a complete top-level JSON value can be detected mid-stream.
+
+Scanning is a single forward pass that only stops at brackets, quotes and
+escapes, and decode attempts run over disjoint spans, so the cost stays
+linear in the length of the output no matter how many stray braces the
+model produces.
+"""
+
+import json
+import re
+from typing import Any, Iterator, Optional
+
+OPENERS = {"{": "}", "[": "]"}
+
+# Jump straight to the next character that matters in each state
+_OPENER_RE = re.compile(r'[{\[]')
+_STRUCTURAL_RE = re.compile(r'[{}\[\]"]')
+_STRING_RE = re.compile(r'["\\]')
+# Cheap check that a candidate could be JSON before trying to decode it
+_VALUE_START_RE = re.compile(r'\{\s*["}]|\[\s*[\]\[{"\-\dtfn]')
+
+_DECODER = json.JSONDecoder()
+
+
+class JsonValueScanner:
+    """
+    Watch streamed text for the first complete top-level JSON object or array.
+
+    Text before the value (prose, ```json fences) is ignored. Quotes and
+    escapes are only tracked inside a candidate value, so apostrophes in
+    surrounding chatter can't throw off the balance.
+
+    A candidate that turns out not to be JSON (mismatched bracket, or a
+    balanced span that doesn't decode) is dropped and scanning carries on
+    from where it stopped, never from back inside the candidate. Before
+    dropping it, its complete direct children are tried, which recovers
+    output like "[see below: {...}" where prose opened a bracket first.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0            # Next character to scan
+        self.start = None       # Offset of the current candidate's opening brace
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+        self.child_start = None
+        self.children = []      # (start, end) of balanced direct children of the candidate
+        self.value = None
+        self.raw = None
+        self.done = False
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Add streamed text. Returns True once a complete value has been decoded
+        (available as .value, with its source text as .raw).
+        """
+        if self.done:
+            return True
+        self.text += chunk
+        return self._scan()
+
+    def finish(self) -> bool:
+        """
+        The stream has ended: fall back to the complete children of a
+        still-open candidate. Returns True if one of them decoded.
+        """
+        if self.done:
+            return True
+        return self.start is not None and self._abandon()
+
+    def resume(self) -> bool:
+        """Look for the next value after the one just found."""
+        self.done = False
+        self.value = None
+        self.raw = None
+        return self._scan()
+
+    def _scan(self) -> bool:
+        text = self.text
+        i = self.pos
+        n = len(text)
+
+        # An escape split across chunks: skip the escaped character
+        if self.escape and i < n:
+            self.escape = False
+            i += 1
+
+        while i < n:
+            if self.start is None:
+                match = _OPENER_RE.search(text, i)
+                if not match:
+                    i = n
+                    break
+                i = match.start()
+                self.start = i
+                self.stack = [OPENERS[text[i]]]
+                i += 1
+                continue
+
+            if self.in_string:
+                match = _STRING_RE.search(text, i)
+                if not match:
+                    i = n
+                    break
+                i = match.start()
+                if text[i] == "\\":
+                    if i + 1 == n:
+                        self.escape = True
+                    i += 2
+                else:
+                    self.in_string = False
+                    i += 1
+                continue
+
+            match = _STRUCTURAL_RE.search(text, i)
+            if not match:
+                i = n
+                break
+            i = match.start()
+            ch = text[i]
+
+            if ch == '"':
+                self.in_string = True
+            elif ch in OPENERS:
+                if len(self.stack) == 1:
+                    self.child_start = i
+                self.stack.append(OPENERS[ch])
+            elif ch != self.stack[-1]:
+                # Mismatched close - not a JSON value
+                self.pos = i + 1
+                if self._abandon():
+                    return True
+            else:
+                self.stack.pop()
+                if len(self.stack) == 1:
+                    self.children.append((self.child_start, i + 1))
+                elif not self.stack:
+                    self.pos = i + 1
+                    if self._decode(self.start, i + 1) or self._abandon():
+                        return True
+            i += 1
+
+        self.pos = min(i, n)
+        return False
+
+    def _decode(self, start: int, end: int) -> bool:
+        if not _VALUE_START_RE.match(self.text, start):
+            return False
+        # Decode the slice, not the whole text: a decode error computes its
+        # line/column by counting from the start of the string it was given
+        raw = self.text[start:end]
+        try:
+            value, stop = _DECODER.raw_decode(raw)
+        except (json.JSONDecodeError, RecursionError):
+            return False
+        if stop != len(raw):
+            return False
+        self.value = value
+        self.raw = raw
+        self.done = True
+        self._reset_candidate()
+        return True
+
+    def _abandon(self) -> bool:
+        """Drop the current candidate, returning True if one of its children decoded."""
+        children = self.children
+        self._reset_candidate()
+        return any(self._decode(start, end) for start, end in children)
+
+    def _reset_candidate(self):
+        self.start = None
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+        self.child_start = None
+        self.children = []
+
+
+def iter_json_values(text: str) -> Iterator[Any]:
+    """Yield each top-level JSON object/array in text, in order."""
+    scanner = JsonValueScanner()
+    found = scanner.feed(text)
+    while found:
+        yield scanner.value
+        found = scanner.resume()
+    if scanner.finish():
+        yield scanner.value
+
+
+def first_json_value(text: str) -> Optional[Any]:
+    """Return the first complete top-level JSON object/array in text, if any."""
+    return next(iter_json_values(text), None)
+
+
+def extract_json(response: str) -> Optional[Any]:
+    """
+    Pull the JSON value out of a model response.
+
+    Tries, in order: the first ``` code block, the whole response, then the
+    top-level values found by scanning - the first object, or failing that
+    the first array (so a stray "[1]" in the chatter doesn't win over the
+    real answer). Every step is linear in the length of the response.
+    """
+    if not response:
+        return None
+
+    fence = response.find("```")
+    if fence != -1:
+        close = response.find("```", fence + 3)
+        if close != -1:
+            block = response[fence + 3:close]
+            if block.startswith("json"):
+                block = block[4:]
+            try:
+                return json.loads(block.strip())
+            except (json.JSONDecodeError, RecursionError):
+                pass
+
+    try:
+        return json.loads(response)
+    except (json.JSONDecodeError, RecursionError):
+        pass
+
+    first = None
+    for value in iter_json_values(response):
+        if isinstance(value, dict):
+            return value
+        if first is None:
+            first = value
+    return first
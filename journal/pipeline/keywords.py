@@ -0,0 +1,100 @@
+"""
+Multi-keyword matching for the fallback parser and topic extraction.
+An Aho-Corasick automaton finds every keyword occurring in a line in one
+pass over its characters, however many keywords there are.
+"""
+
+from collections import deque
+from typing import Any, Iterable, Optional
+
+
+class KeywordMatcher:
+    """
+    Match a fixed set of keywords against text.
+
+    Keywords are given as (keyword, value) pairs in priority order; the
+    position of a pair is its rank. Matching is case-sensitive, so callers
+    pass lowercased keywords and lowercase the text, as the substring
+    checks this replaces did.
+
+    The automaton is stored as a DFA: each state has a dict of the
+    transitions that don't lead back to the root, with failure links
+    already followed, so scanning is one dict lookup per character.
+    """
+
+    def __init__(self, keywords: Iterable[tuple[str, Any]]):
+        self.keywords = list(keywords)
+        self._delta = [{}]      # state -> {char: next state}
+        self._out = [()]        # state -> ranks of keywords ending here
+        self._build()
+        # Bound lookups, so a step is a single call
+        self._step = [edges.get for edges in self._delta]
+
+    def _build(self):
+        outputs = [[]]
+        for rank, (keyword, _) in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = self._delta[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._delta)
+                    self._delta[state][ch] = nxt
+                    self._delta.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(rank)
+
+        # Breadth-first, so a state's failure target is finished before it
+        fail = [0] * len(self._delta)
+        trie = [dict(edges) for edges in self._delta]
+        queue = deque(trie[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state].extend(outputs[fail[state]])
+            # Inherit the failure state's transitions, then override with our own
+            self._delta[state] = {**self._delta[fail[state]], **trie[state]}
+            for ch, nxt in trie[state].items():
+                fail[nxt] = self._delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+
+        self._out = [tuple(sorted(ranks)) for ranks in outputs]
+
+    def ranks(self, text: str) -> set[int]:
+        """Ranks of every keyword that occurs in text."""
+        step = self._step
+        out = self._out
+        found = set(out[0])
+        state = 0
+        for ch in text:
+            state = step[state](ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def first(self, text: str) -> Optional[Any]:
+        """Value of the highest-priority keyword in text, or None."""
+        step = self._step
+        out = self._out
+        best = out[0][0] if out[0] else None
+        state = 0
+        for ch in text:
+            state = step[state](ch, 0)
+            if out[state] and (best is None or out[state][0] < best):
+                best = out[state][0]
+                if best == 0:
+                    break
+        return None if best is None else self.keywords[best][1]
+
+    def all(self, text: str) -> list:
+        """Distinct values of the keywords in text, in priority order."""
+        values = []
+        for rank in sorted(self.ranks(text)):
+            value = self.keywords[rank][1]
+            if value not in values:
+                values.append(value)
+        return values
+
+
+def grouped_keywords(groups: dict) -> list[tuple[str, Any]]:
+    """Flatten {value: [keyword, ...]} into (keyword, value) pairs, keeping group order."""
+    return [(keyword, value) for value, keywords in groups.items() for keyword in keywords]
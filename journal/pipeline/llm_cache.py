@@ -0,0 +1,181 @@
+"""
+Content-addressed on-disk cache for Ollama responses.
+Identical (model, options, prompt) requests are answered from disk instead of re-running inference.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "cache" / "llm"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
+DEFAULT_MAX_AGE_DAYS = 90
+
+
+def make_key(model: str, options: Optional[dict], prompt: str, **fields) -> str:
+    """Hash everything that influences the generated output."""
+    material = json.dumps(
+        {"model": model, "options": options or {}, "prompt": prompt, **fields},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    One JSON file per response, sharded by key prefix.
+
+    File mtimes double as last-access times: hits touch the file, and
+    eviction drops entries older than max_age_days, then the least
+    recently used ones until the cache fits in max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Look up a cached response, refreshing its LRU position on a hit."""
+        path = self._path(key)
+        try:
+            age = time.time() - path.stat().st_mtime
+            value = json.loads(path.read_text(encoding="utf-8")) if age <= self.max_age else None
+        except (OSError, json.JSONDecodeError):
+            value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: dict):
+        """Store a response atomically, evicting old entries if over budget."""
+        path = self._path(key)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            old_size = path.stat().st_size if path.exists() else 0
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"  Cache write failed: {e}")
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - old_size
+            over_budget = self._total_bytes > self.max_bytes
+
+        if over_budget:
+            self.evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """List (mtime, size, path) for every cached response."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        now = time.time()
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for mtime, size, path in entries:
+            expired = now - mtime > self.max_age
+            if not expired and total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._total_bytes = total
+            self.evictions += removed
+        return removed
+
+    def stats(self) -> dict:
+        """Hit/miss counters for the current run."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0
+        }
+
+
+_CACHE = None
+_ENABLED = True
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Get the shared cache, or None when caching is disabled."""
+    global _CACHE
+    if not _ENABLED:
+        return None
+    if _CACHE is None:
+        _CACHE = ResponseCache()
+    return _CACHE
+
+
+def configure(enabled: bool = True, cache_dir: Optional[Path] = None, **limits):
+    """Enable/disable the shared cache or point it at another directory."""
+    global _CACHE, _ENABLED
+    _ENABLED = enabled
+    if cache_dir is not None or limits:
+        _CACHE = ResponseCache(cache_dir or DEFAULT_CACHE_DIR, **limits)
+
+
+def format_stats() -> str:
+    """One-line summary of cache activity for end-of-run logging."""
+    cache = get_cache()
+    if cache is None:
+        return "LLM cache: disabled"
+    s = cache.stats()
+    return f"LLM cache: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']}% hit rate), {s['evictions']} evicted"
@@ -0,0 +1,687 @@
+"""
+Shared Ollama client used by the parser and topic modules.
+Keeps a pool of keep-alive HTTP connections so repeated prompts reuse sockets,
+and spreads requests across one or more Ollama hosts.
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+try:
+    from . import llm_cache, telemetry
+    from .jsonscan import JsonValueScanner
+except ImportError:
+    import llm_cache
+    import telemetry
+    from jsonscan import JsonValueScanner
+
+DEFAULT_URL = "http://localhost:11434"
+DEFAULT_TIMEOUT = 120
+
+# Optional list of Ollama hosts: {"endpoints": [{"url": "http://box:11434", "max_concurrent": 2}]}
+ENDPOINTS_CONFIG = Path(__file__).parent.parent / "config" / "ollama.json"
+
+# Requests each host serves at once unless configured otherwise (Ollama's OLLAMA_NUM_PARALLEL)
+DEFAULT_MAX_CONCURRENT = 1
+
+# Timeout for the health check that decides whether an ejected host is re-admitted
+HEALTH_TIMEOUT = 5
+
+# Retries for connection failures (not timeouts): waits BACKOFF_BASE, 2x, 4x... seconds
+RETRIES = 2
+BACKOFF_BASE = 0.5
+
+# How long Ollama keeps the model loaded after each request (None = server default)
+KEEP_ALIVE = None
+
+# Temperature Ollama samples at when a request doesn't set one
+OLLAMA_DEFAULT_TEMPERATURE = 0.8
+
+# Consecutive failures before the circuit opens, and how long it stays open
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 60
+
+# Errors that mean a pooled keep-alive socket was closed by the server
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+def normalize_url(host: str) -> str:
+    """Turn "box:11434" or "http://box:11434/" into "http://box:11434"."""
+    host = host.strip()
+    if "://" not in host:
+        host = f"http://{host}"
+    return host.rstrip("/")
+
+
+def get_base_url() -> str:
+    """Get the Ollama base URL, honouring OLLAMA_HOST like the ollama CLI does."""
+    host = os.environ.get("OLLAMA_HOST", "").strip()
+    return normalize_url(host) if host else DEFAULT_URL
+
+
+def load_endpoint_configs() -> list[dict]:
+    """
+    Get the Ollama hosts to use, as [{"url": ..., "max_concurrent": N}].
+
+    OLLAMA_HOSTS (comma-separated) wins, then config/ollama.json, then the
+    single OLLAMA_HOST / localhost endpoint.
+    """
+    hosts = os.environ.get("OLLAMA_HOSTS", "").strip()
+    if hosts:
+        return [{"url": normalize_url(host)} for host in hosts.split(",") if host.strip()]
+
+    if ENDPOINTS_CONFIG.exists():
+        try:
+            config = json.loads(ENDPOINTS_CONFIG.read_text(encoding="utf-8"))
+            endpoints = [
+                {**endpoint, "url": normalize_url(endpoint["url"])}
+                for endpoint in config.get("endpoints", [])
+            ]
+            if endpoints:
+                return endpoints
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            print(f"  Ignoring {ENDPOINTS_CONFIG.name}: {e}")
+
+    return [{"url": get_base_url()}]
+
+
+class ConnectionPool:
+    """Thread-safe pool of persistent HTTP connections to one Ollama host."""
+
+    def __init__(self, base_url: str, max_idle: int = 8):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.base_url = base_url
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.https = parsed.scheme == "https"
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def acquire(self, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        """Get a connection; returns (connection, reused)."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self.created += 1
+
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            return conn_class(self.host, self.port, timeout=timeout), False
+
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def release(self, conn: http.client.HTTPConnection):
+        """Return a healthy connection to the pool."""
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def discard(self, conn: http.client.HTTPConnection):
+        """Drop a connection that errored or was abandoned mid-response."""
+        conn.close()
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class CircuitBreaker:
+    """
+    Stop calling Ollama after repeated failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail immediately. Once `reset_timeout` seconds have passed, one
+    trial call is let through (half-open); success closes the circuit,
+    failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        name: str = "Ollama"
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a call may go out now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_in_flight or time.time() - self.opened_at < self.reset_timeout:
+                return False
+            self.trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                if self.opened_at is None:
+                    print(f"  {self.name} failed {self.failures} times in a row - circuit open for {self.reset_timeout}s")
+                self.opened_at = time.time()
+
+
+class Endpoint:
+    """One Ollama host: its connections, circuit breaker and request counts."""
+
+    def __init__(self, url: str, max_concurrent: int = DEFAULT_MAX_CONCURRENT):
+        self.url = url
+        self.max_concurrent = max(1, max_concurrent)
+        self.pool = ConnectionPool(url, max_idle=max(8, self.max_concurrent))
+        self.breaker = CircuitBreaker(name=url)
+        self.outstanding = 0
+        self.served = 0
+        self.failed = 0
+
+    def check_health(self) -> bool:
+        """GET /api/version on a fresh connection."""
+        conn_class = http.client.HTTPSConnection if self.pool.https else http.client.HTTPConnection
+        conn = conn_class(self.pool.host, self.pool.port, timeout=HEALTH_TIMEOUT)
+        try:
+            conn.request("GET", "/api/version")
+            return conn.getresponse().status == 200
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+
+
+class EndpointPool:
+    """
+    Spread requests across Ollama hosts, least outstanding requests first.
+
+    Each host serves at most its max_concurrent requests at once; callers
+    wait for a free slot. A host whose circuit breaker opens is ejected
+    from routing. Once its reset timeout has passed, a health check
+    decides whether it's re-admitted or stays out for another timeout.
+    """
+
+    def __init__(self, endpoints: list[Endpoint]):
+        self.endpoints = endpoints
+        self._cond = threading.Condition()
+
+    @property
+    def capacity(self) -> int:
+        """Total concurrent requests across all hosts."""
+        return sum(endpoint.max_concurrent for endpoint in self.endpoints)
+
+    def all_ejected(self) -> bool:
+        return all(endpoint.breaker.is_open for endpoint in self.endpoints)
+
+    def _readmit_recovered(self):
+        for endpoint in self.endpoints:
+            # allow() lets exactly one caller through once the reset timeout has passed
+            if endpoint.breaker.is_open and endpoint.breaker.allow():
+                if endpoint.check_health():
+                    endpoint.breaker.record_success()
+                    print(f"  {endpoint.url} is healthy again - re-admitted")
+                else:
+                    endpoint.breaker.record_failure()
+                with self._cond:
+                    self._cond.notify_all()
+
+    def acquire(self, avoid: Optional[Endpoint] = None) -> Optional[Endpoint]:
+        """
+        Reserve a slot on the admitted host with the fewest requests in flight,
+        preferring any host other than `avoid` (e.g. the one that just failed).
+        Blocks while every admitted host is at its cap; returns None if all
+        hosts are ejected.
+        """
+        while True:
+            self._readmit_recovered()
+            with self._cond:
+                admitted = [e for e in self.endpoints if not e.breaker.is_open]
+                if not admitted:
+                    return None
+                preferred = [e for e in admitted if e is not avoid] or admitted
+                free = [e for e in preferred if e.outstanding < e.max_concurrent]
+                if free:
+                    endpoint = min(free, key=lambda e: e.outstanding)
+                    endpoint.outstanding += 1
+                    return endpoint
+                # Wake up when a slot frees, or periodically to re-check ejected hosts
+                self._cond.wait(1.0)
+
+    def release(self, endpoint: Endpoint, ok: bool):
+        with self._cond:
+            endpoint.outstanding -= 1
+            if ok:
+                endpoint.served += 1
+            else:
+                endpoint.failed += 1
+            self._cond.notify_all()
+
+    def close(self):
+        for endpoint in self.endpoints:
+            endpoint.pool.close()
+
+
+_ENDPOINTS = None
+_ENDPOINTS_LOCK = threading.Lock()
+
+
+def get_endpoints() -> EndpointPool:
+    """Get the shared endpoint pool, creating it from configuration on first use."""
+    global _ENDPOINTS
+    with _ENDPOINTS_LOCK:
+        if _ENDPOINTS is None:
+            _ENDPOINTS = EndpointPool([
+                Endpoint(config["url"], config.get("max_concurrent", DEFAULT_MAX_CONCURRENT))
+                for config in load_endpoint_configs()
+            ])
+        return _ENDPOINTS
+
+
+def get_pool() -> ConnectionPool:
+    """Connection pool of the first configured host."""
+    return get_endpoints().endpoints[0].pool
+
+
+def configure(url: Union[None, str, list] = None, max_concurrent: int = DEFAULT_MAX_CONCURRENT):
+    """
+    Point the shared client at other Ollama hosts (closes pooled connections).
+
+    url may be a single URL or a list of URLs; None goes back to the
+    configured hosts. Every host gets max_concurrent slots.
+    """
+    global _ENDPOINTS
+    with _ENDPOINTS_LOCK:
+        if _ENDPOINTS is not None:
+            _ENDPOINTS.close()
+        if url is None:
+            _ENDPOINTS = None
+            return
+        urls = [url] if isinstance(url, str) else url
+        _ENDPOINTS = EndpointPool([Endpoint(normalize_url(u), max_concurrent) for u in urls])
+
+
+def capacity() -> int:
+    """How many prompts the configured hosts can run at once."""
+    return get_endpoints().capacity
+
+
+def circuit_open() -> bool:
+    """True while every Ollama host is considered down and calls are being skipped."""
+    return get_endpoints().all_ejected()
+
+
+def format_endpoint_stats() -> str:
+    """Per-host request counts for end-of-run logging."""
+    lines = ["Ollama hosts:"]
+    for endpoint in get_endpoints().endpoints:
+        state = "ejected" if endpoint.breaker.is_open else "ok"
+        lines.append(f"  {endpoint.url}: {endpoint.served} served, {endpoint.failed} failed ({state})")
+    return "\n".join(lines)
+
+
+def post_json(
+    path: str,
+    payload: dict,
+    timeout: float = DEFAULT_TIMEOUT,
+    pool: Optional[ConnectionPool] = None
+) -> dict:
+    """
+    POST a JSON payload over a pooled connection and decode the JSON reply.
+
+    A reused keep-alive socket that turns out to be closed is retried once
+    on a fresh connection. Other errors propagate to the caller. Goes to
+    the first configured host unless a pool is given.
+    """
+    pool = pool or get_pool()
+    body = json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+    for attempt in range(2):
+        conn, reused = pool.acquire(timeout)
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except STALE_CONNECTION_ERRORS:
+            pool.discard(conn)
+            if reused and attempt == 0:
+                continue
+            raise
+        except BaseException:
+            pool.discard(conn)
+            raise
+
+        if response.will_close:
+            pool.discard(conn)
+        else:
+            pool.release(conn)
+
+        if response.status != 200:
+            raise http.client.HTTPException(
+                f"HTTP {response.status} from {path}: {data[:200].decode('utf-8', 'replace')}"
+            )
+        return json.loads(data.decode("utf-8"))
+
+    raise http.client.HTTPException(f"Could not reach {pool.base_url}")
+
+
+def stream_until_json(
+    path: str,
+    payload: dict,
+    timeout: float = DEFAULT_TIMEOUT,
+    pool: Optional[ConnectionPool] = None
+) -> dict:
+    """
+    POST a streaming request and read the NDJSON token stream.
+
+    Stops reading as soon as the generated text contains a complete
+    top-level JSON value; closing the connection makes Ollama abort the
+    rest of the generation. Returns the final (or last seen) stream message
+    with "response" set to the text generated so far, and "json" holding the
+    decoded value when one was found.
+    """
+    pool = pool or get_pool()
+    body = json.dumps({**payload, "stream": True}).encode("utf-8")
+    headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+    for attempt in range(2):
+        conn, reused = pool.acquire(timeout)
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            response = conn.getresponse()
+        except STALE_CONNECTION_ERRORS:
+            pool.discard(conn)
+            if reused and attempt == 0:
+                continue
+            raise
+        except BaseException:
+            pool.discard(conn)
+            raise
+        break
+    else:
+        raise http.client.HTTPException(f"Could not reach {pool.base_url}")
+
+    try:
+        if response.status != 200:
+            data = response.read()
+            raise http.client.HTTPException(
+                f"HTTP {response.status} from {path}: {data[:200].decode('utf-8', 'replace')}"
+            )
+
+        scanner = JsonValueScanner()
+        message = {}
+        chunks = 0
+        first_chunk_at = None
+        while True:
+            line = response.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            message = json.loads(line.decode("utf-8"))
+            if "error" in message:
+                raise http.client.HTTPException(f"Ollama error: {message['error']}")
+
+            chunks += 1
+            if first_chunk_at is None:
+                first_chunk_at = time.time()
+
+            if scanner.feed(message.get("response", "")):
+                # Complete value received - abandon the rest of the generation.
+                # Ollama's final stats never arrive, so estimate generation from
+                # the chunks seen (one token each)
+                pool.discard(conn)
+                return {
+                    **message, "response": scanner.raw, "json": scanner.value, "done": True,
+                    "stopped_early": True, "estimated": True, "eval_count": chunks,
+                    "eval_duration": int((time.time() - first_chunk_at) * 1e9)
+                }
+
+            if message.get("done"):
+                break
+    except BaseException:
+        pool.discard(conn)
+        raise
+
+    response.read()
+    if response.will_close:
+        pool.discard(conn)
+    else:
+        pool.release(conn)
+    return {**message, "response": scanner.text}
+
+
+def generate(
+    prompt: str,
+    model: str = "mistral",
+    options: Optional[dict] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    stream_json: bool = False,
+    tags: Optional[dict] = None,
+    validate: Optional[Callable[[dict], bool]] = None,
+    cacheable: bool = False,
+    **fields
+) -> Optional[dict]:
+    """
+    Call /api/generate and return the decoded Ollama response.
+
+    Extra keyword arguments (e.g. system, format, keep_alive) are passed
+    through in the request body. The returned dict gains an "elapsed" key
+    with wall-clock seconds. Responses are served from the LLM cache when
+    an identical request was made before. Only complete responses that
+    `validate` (given the response dict) accepts are cached, without their
+    "context" tokens; sampled requests (temperature > 0) bypass the cache,
+    as a rerun wouldn't give the same answer, unless cacheable=True says
+    any one sample of the prompt will do. Connection failures are retried
+    on the next host (or, with a single host, after an exponential backoff);
+    returns None if the call failed or every host is ejected. The host that
+    answered is recorded under "endpoint".
+
+    With stream_json=True the response is streamed and cut off as soon as a
+    complete JSON object/array has been generated; the decoded value is
+    returned under "json".
+
+    Every call is recorded by telemetry along with `tags` (e.g. week, day, kind).
+    """
+    start = time.time()
+    result = _generate(prompt, model, options, timeout, stream_json, validate, cacheable, fields)
+    telemetry.record(model, result, time.time() - start, tags)
+    return result
+
+
+def _generate(
+    prompt: str,
+    model: str,
+    options: Optional[dict],
+    timeout: float,
+    stream_json: bool,
+    validate: Optional[Callable[[dict], bool]],
+    cacheable: bool,
+    fields: dict
+) -> Optional[dict]:
+    cache = llm_cache.get_cache()
+    if not cacheable and (options or {}).get("temperature", OLLAMA_DEFAULT_TEMPERATURE) > 0:
+        cache = None
+    cache_key = None
+    if cache is not None:
+        cache_fields = {k: v for k, v in fields.items() if k != "keep_alive"}
+        cache_key = llm_cache.make_key(model, options, prompt, **cache_fields)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "elapsed": 0.0, "cached": True}
+
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False,
+        "options": options or {},
+        **fields
+    }
+    if KEEP_ALIVE is not None:
+        payload.setdefault("keep_alive", KEEP_ALIVE)
+
+    endpoints = get_endpoints()
+    endpoint = None
+    start = time.time()
+    for attempt in range(RETRIES + 1):
+        endpoint = endpoints.acquire(avoid=endpoint)
+        if endpoint is None:
+            return None
+        ok = False
+        try:
+            if stream_json:
+                result = stream_until_json("/api/generate", payload, timeout, endpoint.pool)
+            else:
+                result = post_json("/api/generate", payload, timeout, endpoint.pool)
+            ok = True
+        except socket.timeout as e:
+            # Slow, not down - retrying would just wait out the timeout again
+            endpoint.breaker.record_failure()
+            print(f"  Timed out after {timeout}s on {endpoint.url}: {e}")
+            return None
+        except (OSError, http.client.HTTPException) as e:
+            endpoint.breaker.record_failure()
+            if attempt < RETRIES and not endpoints.all_ejected():
+                if len(endpoints.endpoints) > 1:
+                    # Another host can take the retry straight away
+                    print(f"  Connection error on {endpoint.url}: {e} (retrying on another host)")
+                    continue
+                delay = BACKOFF_BASE * 2 ** attempt
+                print(f"  Connection error: {e} (retrying in {delay:.1f}s)")
+                time.sleep(delay)
+                continue
+            print(f"  Connection error: {e}")
+            return None
+        except Exception as e:
+            # Ollama answered, just not usefully - that's not an outage
+            endpoint.breaker.record_success()
+            print(f"  Error: {e}")
+            return None
+        finally:
+            endpoints.release(endpoint, ok)
+        endpoint.breaker.record_success()
+        break
+
+    result["endpoint"] = endpoint.url
+    result["elapsed"] = time.time() - start
+    if cache_key is not None and result.get("done") and result.get("response"):
+        if validate is None or validate(result):
+            # "context" is the prompt's token ids - large, and not needed to replay the answer
+            cache.put(cache_key, {k: v for k, v in result.items() if k != "context"})
+    return result
+
+
+def set_keep_alive(keep_alive: Optional[str]):
+    """Ask Ollama to keep the model loaded this long (e.g. "30m") after every request."""
+    global KEEP_ALIVE
+    KEEP_ALIVE = keep_alive
+
+
+def warm_up(model: str = "mistral", keep_alive: str = "30m", timeout: float = DEFAULT_TIMEOUT) -> Optional[dict]:
+    """
+    Load the model before the first real prompt and measure cold vs warm latency.
+
+    Sends an empty prompt (which only loads the model) with an explicit
+    keep_alive, then a second one to see what a call costs once loaded.
+    All hosts are warmed in parallel; the slowest one sets the timings.
+
+    Returns:
+        {"cold": seconds, "load": model load seconds reported by Ollama, "warm": seconds},
+        or None if no host could be reached
+    """
+    set_keep_alive(keep_alive)
+    payload = {"model": model, "prompt": "", "keep_alive": keep_alive}
+
+    def warm(endpoint: Endpoint) -> Optional[dict]:
+        timings = {}
+        for label in ("cold", "warm"):
+            start = time.time()
+            try:
+                result = post_json("/api/generate", payload, timeout, endpoint.pool)
+            except (OSError, http.client.HTTPException) as e:
+                endpoint.breaker.record_failure()
+                print(f"  Warm-up failed on {endpoint.url}: {e}")
+                return None
+            endpoint.breaker.record_success()
+            timings[label] = time.time() - start
+            if label == "cold":
+                timings["load"] = result.get("load_duration", 0) / 1e9
+        return timings
+
+    endpoints = [e for e in get_endpoints().endpoints if not e.breaker.is_open]
+    if not endpoints:
+        return None
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+        results = [r for r in pool.map(warm, endpoints) if r]
+    if not results:
+        return None
+    return {key: max(r[key] for r in results) for key in ("cold", "load", "warm")}
+
+
+def release(model: str = "mistral", timeout: float = 30) -> bool:
+    """Unload the model on every host now instead of waiting for keep_alive to expire."""
+    released = True
+    for endpoint in get_endpoints().endpoints:
+        try:
+            post_json("/api/generate", {"model": model, "prompt": "", "keep_alive": 0}, timeout, endpoint.pool)
+        except (OSError, http.client.HTTPException) as e:
+            print(f"  Release failed on {endpoint.url}: {e}")
+            released = False
+    return released
+
+
+def call_ollama(
+    prompt: str,
+    model: str = "mistral",
+    options: Optional[dict] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    tags: Optional[dict] = None,
+    cacheable: bool = False
+) -> tuple[Optional[str], float]:
+    """
+    Generate a completion for a prompt (cacheable as for generate()).
+
+    Returns:
+        Tuple of (response text or None on failure, elapsed seconds)
+    """
+    result = generate(prompt, model, options, timeout, tags=tags, cacheable=cacheable)
+    if result is None:
+        return None, 0
+    return result.get("response", "").strip(), result["elapsed"]
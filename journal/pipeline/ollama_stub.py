@@ -0,0 +1,428 @@
+"""
+Stand-in Ollama server for exercising the LLM path without a model.
+Implements /api/generate (streaming and non-streaming) with configurable
+latency, injected failures and a concurrency limit; answers are built by
+the fallback parser, so they look like what the real model would extract.
+
+Usage:
+    python ollama_stub.py                              # Serve on 127.0.0.1:11435
+    python ollama_stub.py --latency normal:1.5,0.4     # First-token latency distribution
+    python ollama_stub.py --error-rate 0.1 --parallel 1
+
+Then point the pipeline at it:
+    OLLAMA_HOST=http://127.0.0.1:11435 python sync.py --local
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Union
+
+try:
+    from .fallback_parser import parse_day_section, parse_goals_text, parse_review_section
+    from .jsonscan import first_json_value
+except ImportError:
+    from fallback_parser import parse_day_section, parse_goals_text, parse_review_section
+    from jsonscan import first_json_value
+
+DEFAULT_PORT = 11435
+CHARS_PER_TOKEN = 4  # Streamed chunk size, and the token estimate for prompt_eval_count
+
+Latency = Union[None, float, str, Callable[[], float]]
+
+
+def parse_latency(spec: Latency, rng: Optional[random.Random] = None) -> Callable[[], float]:
+    """
+    Turn a latency spec into a sampler returning seconds.
+
+    Specs: a number (fixed), "uniform:LOW,HIGH", "normal:MEAN,SD",
+    "lognormal:MEDIAN,SIGMA" or "exp:MEAN". Samples are never negative.
+    """
+    rng = rng or random.Random()
+    if spec is None:
+        return lambda: 0.0
+    if callable(spec):
+        return spec
+    if isinstance(spec, (int, float)):
+        return lambda: float(spec)
+
+    kind, _, args = spec.partition(":")
+    if not args:
+        value = float(kind)
+        return lambda: value
+    params = [float(x) for x in args.split(",")]
+
+    if kind == "uniform":
+        return lambda: rng.uniform(params[0], params[1])
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(params[0], params[1]))
+    if kind == "lognormal":
+        mu = math.log(params[0])
+        return lambda: rng.lognormvariate(mu, params[1])
+    if kind == "exp":
+        return lambda: rng.expovariate(1 / params[0]) if params[0] > 0 else 0.0
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def _section_text(prompt: str) -> str:
+    """The journal text of a prompt (after TEXT:, before any trailing schema)."""
+    text = prompt.split("TEXT:\n", 1)[1] if "TEXT:\n" in prompt else prompt
+    return text.split("\n\nReturn", 1)[0]
+
+
+def _day_json(text: str, day_name: str) -> dict:
+    """A day record shaped like the model's output (no day/parser tags)."""
+    record = parse_day_section(text, day_name)
+    return {k: v for k, v in record.items() if k not in ("day", "parser")}
+
+
+def rule_based_response(payload: dict) -> str:
+    """
+    Answer an extraction prompt the way the model would, using the regex parser.
+
+    The prompt kind is recognised from the system prompt (or, for prompts
+    that inline their instructions, the prompt itself). Repair prompts get
+    the first JSON value in the broken output; anything else (e.g. the
+    topics narrative) gets a canned sentence.
+    """
+    prompt = payload.get("prompt", "")
+    instructions = (payload.get("system") or "") + "\n" + prompt.split("\n", 1)[0]
+
+    if "\nOUTPUT:\n" in prompt:
+        value = first_json_value(prompt.split("\nOUTPUT:\n", 1)[1])
+        return json.dumps(value if value is not None else {})
+
+    if "several journal days" in instructions:
+        days = re.findall(r'=== (\d{4}-\d{2}-\d{2}) \((\w+)\) ===\n(.*?)(?=\n\n=== |\n\nReturn|\Z)', prompt, re.DOTALL)
+        return json.dumps({date: _day_json(text, day_name) for date, day_name, text in days})
+
+    if "weekly goals" in instructions:
+        return json.dumps(parse_goals_text(_section_text(prompt)))
+
+    if "week review" in instructions:
+        review = parse_review_section(_section_text(prompt), [])
+        return json.dumps({
+            "summary": review.get("summary", ""),
+            "goals_completed": [],
+            "highlight": review.get("highlight", ""),
+            "next_week": review.get("next_week", "")
+        })
+
+    if "journal day" in instructions:
+        date_match = re.search(r'Date: \S+ \((\w+)\)', prompt)
+        return json.dumps(_day_json(_section_text(prompt), date_match.group(1) if date_match else "Monday"))
+
+    return "This week was a steady mix of practice, building and reading."
+
+
+class OllamaStub:
+    """
+    In-process stand-in for the Ollama HTTP API.
+
+    Latency is split into a per-model load time (first request, or after
+    an unload via keep_alive=0), a first-token delay standing in for prompt
+    evaluation, and a per-token delay while the answer streams. Up to
+    `parallel` requests are served at once and the rest queue, like
+    OLLAMA_NUM_PARALLEL; with `max_queue` set, requests beyond it get a 503
+    like OLLAMA_MAX_QUEUE.
+
+    Failure injection (each a probability per request):
+        error_rate       HTTP 500 with an Ollama-style {"error": ...} body
+        disconnect_rate  connection closed without a response
+        hang_rate        no response for `hang_seconds` (trips client timeouts)
+
+    Counters in .stats: requests, completed, errors, disconnects, hangs,
+    rejected, aborted (client hung up mid-stream) and peak_concurrency.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Latency = None,
+        token_latency: Latency = None,
+        load_latency: Latency = None,
+        parallel: int = 4,
+        max_queue: Optional[int] = None,
+        error_rate: float = 0.0,
+        disconnect_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        hang_seconds: float = 300.0,
+        responder: Callable[[dict], str] = rule_based_response,
+        seed: Optional[int] = None
+    ):
+        self.rng = random.Random(seed)
+        self.latency = parse_latency(latency, self.rng)
+        self.token_latency = parse_latency(token_latency, self.rng)
+        self.load_latency = parse_latency(load_latency, self.rng)
+        self.parallel = parallel
+        self.max_queue = max_queue
+        self.error_rate = error_rate
+        self.disconnect_rate = disconnect_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.responder = responder
+
+        self.loaded = set()
+        self.stats = {}
+        self.reset_stats()
+        self._slots = threading.Semaphore(parallel)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiting = 0
+        self._stopping = threading.Event()
+
+        self.server = _Server((host, port), _Handler)
+        self.server.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        self.stats = {
+            "requests": 0, "completed": 0, "errors": 0, "disconnects": 0,
+            "hangs": 0, "rejected": 0, "aborted": 0, "peak_concurrency": 0
+        }
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self.rng.random() < rate
+
+    def start(self) -> "OllamaStub":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "OllamaStub":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def acquire_slot(self) -> bool:
+        """Wait for a free slot; False if the queue is full."""
+        with self._lock:
+            if self.max_queue is not None and self._active >= self.parallel and self._waiting >= self.max_queue:
+                self.stats["rejected"] += 1
+                return False
+            self._waiting += 1
+        self._slots.acquire()
+        with self._lock:
+            self._waiting -= 1
+            self._active += 1
+            self.stats["peak_concurrency"] = max(self.stats["peak_concurrency"], self._active)
+        return True
+
+    def release_slot(self):
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+
+    def wait(self, seconds: float):
+        """Sleep, but wake up early if the server is stopping."""
+        if seconds > 0:
+            self._stopping.wait(seconds)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections is routine, not worth a traceback
+        pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        stub = self.server.stub
+        if self.path == "/api/version":
+            self._send_json(200, {"version": "0.0.0-stub"})
+        elif self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": name} for name in sorted(stub.loaded)]})
+        elif self.path == "/":
+            data = b"Ollama is running"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "invalid JSON body"})
+            return
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        stub._count("requests")
+        if not stub.acquire_slot():
+            self._send_json(503, {"error": "server busy, please try again.  maximum pending requests exceeded"})
+            return
+        try:
+            self._generate(stub, payload)
+        finally:
+            stub.release_slot()
+
+    def _generate(self, stub: OllamaStub, payload: dict):
+        if stub._roll(stub.hang_rate):
+            stub._count("hangs")
+            stub.wait(stub.hang_seconds)
+            self.close_connection = True
+            return
+        if stub._roll(stub.disconnect_rate):
+            stub._count("disconnects")
+            self.close_connection = True
+            return
+        if stub._roll(stub.error_rate):
+            stub._count("errors")
+            self._send_json(500, {"error": "injected failure"})
+            return
+
+        model = payload.get("model", "mistral")
+        prompt = payload.get("prompt", "")
+        start = time.time()
+
+        load = 0.0
+        if model not in stub.loaded:
+            load = stub.load_latency()
+            stub.wait(load)
+            stub.loaded.add(model)
+
+        if not prompt:
+            # Load/unload request (warm-up, keep_alive=0)
+            if payload.get("keep_alive") in (0, "0", "0s"):
+                stub.loaded.discard(model)
+            stub._count("completed")
+            self._send_json(200, {
+                "model": model, "response": "", "done": True,
+                "done_reason": "unload" if model not in stub.loaded else "load",
+                "load_duration": int(load * 1e9), "total_duration": int((time.time() - start) * 1e9)
+            })
+            return
+
+        prompt_eval = stub.latency()
+        stub.wait(prompt_eval)
+        text = stub.responder(payload)
+        tokens = [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+        prompt_tokens = (len(payload.get("system") or "") + len(prompt)) // CHARS_PER_TOKEN + 1
+
+        def final_message(response: str, eval_seconds: float) -> dict:
+            return {
+                "model": model, "response": response, "done": True, "done_reason": "stop",
+                "total_duration": int((time.time() - start) * 1e9),
+                "load_duration": int(load * 1e9),
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": int(prompt_eval * 1e9),
+                "eval_count": len(tokens),
+                "eval_duration": int(eval_seconds * 1e9),
+                # Stand-in token ids of the exchange, which /api/generate returns
+                "context": list(range(prompt_tokens + len(tokens)))
+            }
+
+        if not payload.get("stream", True):
+            eval_seconds = sum(stub.token_latency() for _ in tokens)
+            stub.wait(eval_seconds)
+            stub._count("completed")
+            self._send_json(200, final_message(text, eval_seconds))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        eval_start = time.time()
+        try:
+            for token in tokens:
+                stub.wait(stub.token_latency())
+                self._write_chunk({"model": model, "response": token, "done": False})
+            self._write_chunk(final_message("", time.time() - eval_start))
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client stopped reading (e.g. stream_until_json got its JSON)
+            stub._count("aborted")
+            self.close_connection = True
+            return
+        stub._count("completed")
+
+    def _write_chunk(self, message: dict):
+        line = (json.dumps(message) + "\n").encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in Ollama server for pipeline testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", default="0", help="First-token latency, e.g. 0.5 or normal:1.5,0.4")
+    parser.add_argument("--token-latency", default="0", help="Per-token latency while streaming")
+    parser.add_argument("--load-latency", default="0", help="Model load time on first use")
+    parser.add_argument("--parallel", type=int, default=4, help="Requests served at once (default: 4)")
+    parser.add_argument("--max-queue", type=int, help="Queued requests before answering 503")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an HTTP 500")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="Probability of dropping the connection")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Probability of never answering")
+    parser.add_argument("--hang-seconds", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, help="Seed for reproducible latencies and failures")
+    args = parser.parse_args()
+
+    stub = OllamaStub(
+        host=args.host, port=args.port,
+        latency=args.latency, token_latency=args.token_latency, load_latency=args.load_latency,
+        parallel=args.parallel, max_queue=args.max_queue,
+        error_rate=args.error_rate, disconnect_rate=args.disconnect_rate,
+        hang_rate=args.hang_rate, hang_seconds=args.hang_seconds,
+        seed=args.seed
+    )
+    print(f"Ollama stand-in listening on {stub.url} (Ctrl+C to stop)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served: {stub.stats}")
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
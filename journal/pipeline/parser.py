@@ -3,147 +3,251 @@ Journal Parser using local Ollama (Mistral) for flexible extraction.
 Processes day-by-day for faster parsing.
 """
 
+import functools
+import hashlib
 import json
 import re
+import threading
 import time
-import urllib.request
-import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+try:
+    from . import llm_cache, telemetry
+    from .fallback_parser import parse_day_section, parse_goals_text, parse_review_section, score_day_confidence
+    from .jsonscan import extract_json
+    from .ollama_client import capacity, circuit_open, generate, warm_up
+    from .sections import index_journal
+except ImportError:
+    import llm_cache
+    import telemetry
+    from fallback_parser import parse_day_section, parse_goals_text, parse_review_section, score_day_confidence
+    from jsonscan import extract_json
+    from ollama_client import capacity, circuit_open, generate, warm_up
+    from sections import index_journal
+
+# Generation options for the extraction prompts
+OLLAMA_OPTIONS = {
+    "num_predict": 1024,  # Smaller limit for single day
+    "temperature": 0      # Deterministic, so answers can be cached
+}
+
+# Batched mode: how much day text to pack into one prompt, and output room per day
+BATCH_TOKEN_BUDGET = 1200
+BATCH_PREDICT_PER_DAY = 512
+BATCH_MAX_PREDICT = 3072
+
+# Hybrid mode: days the regex parser understands at least this well skip the LLM
+HYBRID_THRESHOLD = 0.8
+
+# Bounded retries with a short repair prompt when output isn't valid JSON
+PARSE_RETRIES = 1
+
+# Structure every day record is extracted into
+DAY_SCHEMA = '''{"practice": {"leetcode": [{"name": "...", "difficulty": "easy|medium|hard", "insight": "..."}], "sql": [...], "system_design": [{"name": "...", "type": "HLD|LLD", "insight": "..."}], "ml": [...]}, "building": [{"project": "...", "work": "..."}], "reading": [{"book": "DDIA or AI_Engineering", "chapter": 1, "pages": [1, 20], "insight": "..."}], "exploring": [{"topic": "astronomy|philosophy|history|technology|etc", "content": "..."}], "notes": "..." or null}'''
+GOALS_SCHEMA = '''["goal 1", "goal 2", "goal 3"]'''
+REVIEW_SCHEMA = '''{"summary": "...", "goals_completed": ["goal1", "goal2"], "highlight": "...", "next_week": "..."}'''
+
+
+def _list_of(properties: dict, required: list) -> dict:
+    """JSON schema for an array of objects."""
+    return {
+        "type": "array",
+        "items": {"type": "object", "properties": properties, "required": required}
+    }
 
 
-def get_day_prompt(day_text: str, date_str: str, day_name: str) -> str:
-    """Generate a compact prompt for a single day."""
-    return f'''Extract JSON from this journal day. Return ONLY valid JSON, no explanation.
+_STRING = {"type": "string"}
+_NAMED_ITEM = {"name": _STRING, "insight": _STRING}
+
+# JSON schemas for Ollama's structured output ("format"), mirroring normalize_day_data
+DAY_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "practice": {
+            "type": "object",
+            "properties": {
+                "leetcode": _list_of(
+                    {**_NAMED_ITEM, "difficulty": {"type": ["string", "null"], "enum": ["easy", "medium", "hard", None]}},
+                    ["name"]
+                ),
+                "sql": _list_of(_NAMED_ITEM, ["name"]),
+                "system_design": _list_of(
+                    {**_NAMED_ITEM, "type": {"type": ["string", "null"], "enum": ["HLD", "LLD", None]}},
+                    ["name"]
+                ),
+                "ml": _list_of(_NAMED_ITEM, ["name"])
+            },
+            "required": ["leetcode", "sql", "system_design", "ml"]
+        },
+        "building": _list_of({"project": _STRING, "work": _STRING}, ["project"]),
+        "reading": _list_of(
+            {
+                "book": _STRING,
+                "chapter": {"type": ["integer", "null"]},
+                "pages": {"type": ["array", "null"], "items": {"type": "integer"}},
+                "insight": _STRING
+            },
+            ["book"]
+        ),
+        "exploring": _list_of({"topic": _STRING, "content": _STRING}, ["topic", "content"]),
+        "notes": {"type": ["string", "null"]}
+    },
+    "required": ["practice", "building", "reading", "exploring", "notes"]
+}
+
+GOALS_JSON_SCHEMA = {"type": "array", "items": _STRING}
+
+REVIEW_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": _STRING,
+        "goals_completed": {"type": "array", "items": _STRING},
+        "highlight": _STRING,
+        "next_week": _STRING
+    },
+    "required": ["summary", "goals_completed", "highlight", "next_week"]
+}
+
+
+def get_batch_json_schema(dates: list[str]) -> dict:
+    """JSON schema for a batched response: one day record per date."""
+    return {
+        "type": "object",
+        "properties": {date: DAY_JSON_SCHEMA for date in dates},
+        "required": list(dates)
+    }
 
-Date: {date_str} ({day_name})
 
-TEXT:
-{day_text}
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (~4 characters per token for English)."""
+    return len(text) // 4 + 1
 
-Return this exact structure:
-{{"practice": {{"leetcode": [{{"name": "...", "difficulty": "easy|medium|hard", "insight": "..."}}], "sql": [...], "system_design": [{{"name": "...", "type": "HLD|LLD", "insight": "..."}}], "ml": [...]}}, "building": [{{"project": "...", "work": "..."}}], "reading": [{{"book": "DDIA or AI_Engineering", "chapter": 1, "pages": [1, 20], "insight": "..."}}], "exploring": [{{"topic": "astronomy|philosophy|history|technology|etc", "content": "..."}}], "notes": "..." or null}}'''
 
+# Static instructions + schema for each call kind. They're sent as the
+# system prompt, which Ollama renders ahead of the user prompt, so every
+# call of a kind starts with the same tokens and the model server can
+# reuse the already-evaluated prefix from its KV cache instead of
+# re-reading the schema for every day.
+SYSTEM_PROMPTS = {
+    "day": f'''Extract JSON from a journal day. Return ONLY valid JSON, no explanation.
 
-def get_goals_prompt(goals_text: str) -> str:
-    """Generate prompt for weekly goals."""
-    return f'''Extract the weekly goals as a JSON array. Return ONLY the JSON array.
+Return this exact structure:
+{DAY_SCHEMA}''',
+    "batch": f'''Extract JSON from several journal days. Return ONLY valid JSON, no explanation.
 
-TEXT:
-{goals_text}
+Return one JSON object keyed by the dates given, where each value has this exact structure:
+{DAY_SCHEMA}''',
+    "goals": f'''Extract the weekly goals as a JSON array. Return ONLY the JSON array.
 
-Return like: ["goal 1", "goal 2", "goal 3"]'''
+Return like: {GOALS_SCHEMA}''',
+    "review": f'''Extract week review as JSON. Return ONLY JSON.
 
+Return: {REVIEW_SCHEMA}'''
+}
 
-def get_review_prompt(review_text: str) -> str:
-    """Generate prompt for week review."""
-    return f'''Extract week review as JSON. Return ONLY JSON.
+
+def get_day_prompt(day_text: str, date_str: str, day_name: str) -> str:
+    """Generate the per-day part of a day prompt (instructions are in SYSTEM_PROMPTS)."""
+    return f'''Date: {date_str} ({day_name})
 
 TEXT:
-{review_text}
+{day_text}'''
 
-Return: {{"summary": "...", "goals_completed": ["goal1", "goal2"], "highlight": "...", "next_week": "..."}}'''
 
+def get_batch_prompt(days: list[dict]) -> str:
+    """Generate one prompt covering several days (the schema is in SYSTEM_PROMPTS)."""
+    day_blocks = "\n\n".join(
+        f"=== {day['date']} ({day['day_name']}) ===\n{day['text']}" for day in days
+    )
+    dates = ", ".join(f'"{day["date"]}"' for day in days)
+    return f'''Dates: {dates}
 
-def call_ollama(prompt: str, model: str = "mistral", timeout: int = 120) -> Optional[str]:
-    """Call Ollama with a shorter timeout for day-by-day processing."""
-    url = "http://localhost:11434/api/generate"
+{day_blocks}'''
 
-    payload = json.dumps({
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-        "options": {
-            "num_predict": 1024,  # Smaller limit for single day
-            "temperature": 0.1
-        }
-    }).encode('utf-8')
-
-    try:
-        req = urllib.request.Request(
-            url,
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method='POST'
-        )
 
-        start = time.time()
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            elapsed = time.time() - start
-            return result.get("response", "").strip(), elapsed
+def plan_batches(days: list[dict], token_budget: int = BATCH_TOKEN_BUDGET) -> list[list[dict]]:
+    """
+    Group consecutive days into batches whose text fits the token budget.
 
-    except urllib.error.URLError as e:
-        print(f"  Connection error: {e}")
-        return None, 0
-    except Exception as e:
-        print(f"  Error: {e}")
-        return None, 0
+    Days are packed greedily in order, so results stay in day order. A day
+    that alone uses more than half the budget is long enough to get its own
+    prompt.
+    """
+    batches = []
+    current = []
+    used = 0
+
+    for day in days:
+        tokens = estimate_tokens(day["text"])
+        if tokens > token_budget // 2:
+            if current:
+                batches.append(current)
+                current, used = [], 0
+            batches.append([day])
+            continue
 
+        if current and used + tokens > token_budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(day)
+        used += tokens
 
-def extract_json(response: str) -> Optional[dict]:
-    """Extract JSON from response."""
-    if not response:
-        return None
+    if current:
+        batches.append(current)
+    return batches
 
-    # Try code blocks first
-    match = re.search(r'```(?:json)?\s*([\s\S]*?)```', response)
-    if match:
-        try:
-            return json.loads(match.group(1).strip())
-        except json.JSONDecodeError:
-            pass
 
-    # Try direct parse
-    try:
-        return json.loads(response)
-    except json.JSONDecodeError:
-        pass
+def get_goals_prompt(goals_text: str) -> str:
+    """Generate prompt for weekly goals."""
+    return f'''TEXT:
+{goals_text}'''
 
-    # Try finding JSON object
-    match = re.search(r'(\{[\s\S]*\})', response)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
-            pass
 
-    # Try finding JSON array
-    match = re.search(r'(\[[\s\S]*\])', response)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
-            pass
+def get_review_prompt(review_text: str) -> str:
+    """Generate prompt for week review."""
+    return f'''TEXT:
+{review_text}'''
 
-    return None
+
+def get_repair_prompt(broken_output: str, schema: str) -> str:
+    """Generate a short prompt asking the model to fix its own invalid output."""
+    return f'''This output was supposed to be valid JSON with the structure below, but it isn't. Return ONLY the corrected JSON.
+
+STRUCTURE:
+{schema}
+
+OUTPUT:
+{broken_output}'''
 
 
 def split_journal(markdown: str) -> dict:
-    """Split journal into goals, days, and review sections."""
+    """
+    Split journal into goals, days, and review sections.
+
+    A day's text runs from its header to the next top-level heading (or a
+    "## week-review" heading inside it).
+    """
+    index = index_journal(markdown)
+
     sections = {
-        "goals": "",
+        "goals": index.slice(index.goals).strip(),
         "days": {},
         "review": ""
     }
 
-    # Extract goals section
-    goals_match = re.search(r'##\s*goals?\s*\n(.*?)(?=\n---|\n#\s+\w+day)', markdown, re.DOTALL | re.IGNORECASE)
-    if goals_match:
-        sections["goals"] = goals_match.group(1).strip()
+    for day in index.days:
+        # Anything after the date on the header line belongs to the day, as before
+        sections["days"][day["name"]] = markdown[day["date_end"]:day["content_end"]].strip()
 
-    # Extract each day
-    day_pattern = r'#\s+(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(\w+)\s+(\d+)(.*?)(?=\n#\s+\w+day|\n##\s*week-review|$)'
-    for match in re.finditer(day_pattern, markdown, re.DOTALL | re.IGNORECASE):
-        day_name = match.group(1)
-        day_text = match.group(4).strip()
-        sections["days"][day_name] = day_text
-
-    # Extract week review
-    review_match = re.search(r'##\s*week-review\s*\n(.*?)(?=\n---\s*$|$)', markdown, re.DOTALL | re.IGNORECASE)
-    if review_match:
-        sections["review"] = review_match.group(1).strip()
+    # Drop a closing --- rule
+    review = index.slice(index.review).strip()
+    head, newline, last = review.rpartition("\n")
+    if newline and last.strip() == "---":
+        review = head.strip()
+    sections["review"] = review
 
     return sections
 
@@ -188,22 +292,214 @@ def normalize_day_data(data: dict) -> dict:
     }
 
 
+def call_ollama_json(
+    prompt: str,
+    model: str = "mistral",
+    timeout: int = 120,
+    stream: bool = True,
+    options: Optional[dict] = None,
+    json_schema: Optional[dict] = None,
+    system: Optional[str] = None,
+    tags: Optional[dict] = None,
+    validate: Optional[Callable] = None
+) -> tuple:
+    """
+    Send an extraction prompt and decode the JSON it returns.
+
+    With stream=True the generation is cut off as soon as a complete JSON
+    value has arrived and that value is used directly; otherwise (or if the
+    stream ended without one) the text goes through extract_json. A
+    json_schema is passed to Ollama as the structured output format, and
+    system as the system prompt. tags label the call in the run's metrics.
+    If validate is given, only output whose decoded JSON it accepts is cached.
+
+    Returns:
+        Tuple of (raw response or None on failure, decoded JSON or None, elapsed seconds)
+    """
+    fields = {"format": json_schema} if json_schema else {}
+    if system:
+        fields["system"] = system
+    check = (lambda result: validate(decode_result(result))) if validate else None
+    result = generate(
+        prompt, model, options or OLLAMA_OPTIONS, timeout, stream_json=stream, tags=tags, validate=check, **fields
+    )
+    if result is None:
+        return None, None, 0
+    return result.get("response", "").strip(), decode_result(result), result["elapsed"]
+
+
+def decode_result(result: dict):
+    """The JSON value of a generate() result: the streamed value, else extracted from the text."""
+    data = result.get("json")
+    if data is None:
+        data = extract_json(result.get("response", "").strip())
+    return data
+
+
+def fingerprint_text(text: str) -> str:
+    """
+    Fingerprint a journal section for change detection.
+
+    Whitespace-only edits (trailing spaces, blank lines, re-indentation)
+    don't change the fingerprint; any change to the words does.
+    """
+    lines = [" ".join(line.split()) for line in text.splitlines()]
+    normalized = "\n".join(line for line in lines if line)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def make_day_record(day_name: str, data: dict, fingerprint: str) -> dict:
+    """Build an entries.json record for a day parsed by the LLM."""
+    return {
+        "day": day_name.capitalize(),
+        **normalize_day_data(data),
+        "parser": "ollama",
+        "fingerprint": fingerprint
+    }
+
+
+def apply_fallback(call: dict, result: dict):
+    """Fill in a call's section with the regex parser (used when Ollama gave no usable output)."""
+    if call["kind"] == "goals":
+        result["weekly_goals"] = parse_goals_text(call["text"])
+    elif call["kind"] == "day":
+        result["days"][call["date"]] = parse_day_section(call["text"], call["day_name"])
+    elif call["kind"] == "batch":
+        for day in call["days"]:
+            result["days"][day["date"]] = parse_day_section(day["text"], day["day_name"])
+    else:
+        result["week_review"] = parse_review_section(call["text"], result["weekly_goals"])
+
+
+# Extraction outcomes run_prompts reports for each call
+PARSE_OUTCOMES = ("first_try_valid", "repaired", "dropped", "no_response")
+
+
+def is_valid_output(call: dict, data) -> bool:
+    """Check decoded output has the shape the call's kind expects."""
+    if call["kind"] == "goals":
+        return isinstance(data, list)
+    if call["kind"] == "batch":
+        return isinstance(data, dict) and all(isinstance(data.get(day["date"]), dict) for day in call["days"])
+    return isinstance(data, dict)
+
+
+def format_parse_outcomes(counts: dict) -> str:
+    """One-line summary of extraction outcome counts (summed over a run's weeks) for logging."""
+    o = {outcome: counts.get(outcome, 0) for outcome in PARSE_OUTCOMES}
+    return (f"LLM outputs: {o['first_try_valid']} valid first try, {o['repaired']} repaired, "
+            f"{o['dropped']} dropped, {o['no_response']} no response")
+
+
+def run_prompts(
+    calls: list[dict],
+    model: str = "mistral",
+    jobs: int = 1,
+    stream: bool = True,
+    week: Optional[str] = None
+) -> list[tuple]:
+    """
+    Send prompts to Ollama, up to `jobs` at a time.
+
+    Each call is a dict with "kind", "label", "prompt", "timeout" and the
+    "schema" its output must follow; the kind selects the system prompt.
+    Output that doesn't decode to the expected shape gets up to
+    PARSE_RETRIES short repair prompts.
+
+    Results are (response, data, elapsed, outcome) tuples returned in the
+    same order as `calls` regardless of the order in which they complete;
+    outcome is one of PARSE_OUTCOMES. Each Ollama call is tagged
+    with the week, day(s) and kind for the run's metrics.
+    """
+    print_lock = threading.Lock()
+
+    def run(call):
+        if call["kind"] == "batch":
+            day = ",".join(d["date"] for d in call["days"])
+        else:
+            day = call.get("date")
+        tags = {"week": week, "day": day, "kind": call["kind"]}
+        valid = functools.partial(is_valid_output, call)
+
+        response, data, elapsed = call_ollama_json(
+            call["prompt"], model, timeout=call["timeout"], stream=stream,
+            options=call.get("options"), json_schema=call.get("json_schema"),
+            system=SYSTEM_PROMPTS[call["kind"]], tags=tags, validate=valid
+        )
+
+        if not response:
+            outcome = "no_response"
+        elif is_valid_output(call, data):
+            outcome = "first_try_valid"
+        else:
+            outcome = "dropped"
+            for _ in range(PARSE_RETRIES):
+                fixed, fixed_data, repair_elapsed = call_ollama_json(
+                    get_repair_prompt(response, call["schema"]), model, timeout=60, stream=stream,
+                    options=call.get("options"), json_schema=call.get("json_schema"),
+                    tags={**tags, "repair": True}, validate=valid
+                )
+                elapsed += repair_elapsed
+                if fixed and is_valid_output(call, fixed_data):
+                    response, data, outcome = fixed, fixed_data, "repaired"
+                    break
+
+        with print_lock:
+            note = {"no_response": " (no response)", "repaired": " (repaired)", "dropped": " (invalid JSON)"}.get(outcome, "")
+            print(f"  {call['label']}: {elapsed:.1f}s{note}", flush=True)
+        return response, data, elapsed, outcome
+
+    if jobs <= 1 or len(calls) <= 1:
+        return [run(call) for call in calls]
+
+    with ThreadPoolExecutor(max_workers=min(jobs, len(calls))) as pool:
+        return list(pool.map(run, calls))
+
+
 def parse_journal_daily(
     markdown_text: str,
     week_filename: str,
     model: str = "mistral",
     existing_entries: Optional[dict] = None,
-    force_days: Optional[list] = None
+    force_days: Optional[list] = None,
+    jobs: int = 1,
+    stream: bool = True,
+    batch: bool = False,
+    existing_week: Optional[dict] = None,
+    hybrid: bool = False,
+    confidence_threshold: float = HYBRID_THRESHOLD
 ) -> Optional[dict]:
     """
     Parse journal day-by-day for faster processing.
 
+    Sections are fingerprinted (see fingerprint_text). A day whose text
+    matches the fingerprint stored on its existing entry is reused instead
+    of re-parsed; goals and review are reused the same way from the week's
+    record in weeks.json.
+
+    Any section Ollama didn't produce usable output for is parsed by
+    fallback_parser instead. That covers no response (a timeout, or the
+    circuit breaker in ollama_client being open), output that didn't decode
+    to the expected shape, and days missing from a batch answer. Day records
+    are tagged with the "parser" that produced them, and fallback sections
+    get no fingerprint, so the next sync sends them to Ollama again.
+
+    In hybrid mode every day goes through the regex parser first, and only
+    days scoring below confidence_threshold (see score_day_confidence) are
+    sent to Ollama.
+
     Args:
         markdown_text: Raw journal markdown
         week_filename: e.g., "2025-W02.md"
         model: Ollama model to use
-        existing_entries: Already parsed entries (for CDC - skip existing days)
+        existing_entries: Already parsed entries (for CDC - skip unchanged days)
         force_days: List of day names to force re-parse (e.g., ["Thursday", "Friday"])
+        jobs: Number of prompts to send to Ollama concurrently
+        stream: Stream responses and stop each generation once its JSON is complete
+        batch: Pack several short days into one prompt (see plan_batches)
+        existing_week: This week's record from weeks.json (for CDC on goals/review)
+        hybrid: Regex-parse first and only send low-confidence days to Ollama
+        confidence_threshold: Minimum regex confidence to skip Ollama in hybrid mode
     """
     # Parse week identifier
     match = re.match(r'(\d{4})-W(\d{2})', week_filename)
@@ -213,7 +509,8 @@ def parse_journal_daily(
 
     year, week = int(match.group(1)), int(match.group(2))
 
-    print(f"Parsing {week_filename} (incremental mode)")
+    mode = "hybrid" if hybrid else "incremental"
+    print(f"Parsing {week_filename} ({mode} mode, {jobs} job{'s' if jobs != 1 else ''})")
     print("=" * 50)
 
     # Split into sections
@@ -222,28 +519,36 @@ def parse_journal_daily(
     result = {
         "weekly_goals": [],
         "days": {},
-        "week_review": {}
+        "week_review": {},
+        "fingerprints": {}
     }
 
-    total_time = 0
     skipped = 0
+    regex_days = 0
+    calls = []
+    pending_days = []
+    previous = (existing_week or {}).get("fingerprints", {})
 
-    # Parse goals (always, they might change)
+    # Goals (re-parsed only when their text changed)
     if sections["goals"]:
-        print("Parsing weekly goals...", end=" ", flush=True)
-        response, elapsed = call_ollama(get_goals_prompt(sections["goals"]), model, timeout=60)
-        total_time += elapsed
-        if response:
-            goals = extract_json(response)
-            if isinstance(goals, list):
-                result["weekly_goals"] = goals
-                print(f"OK ({elapsed:.1f}s) - {len(goals)} goals")
-            else:
-                print(f"OK ({elapsed:.1f}s) - couldn't parse")
+        goals_fp = fingerprint_text(sections["goals"])
+        if previous.get("goals") == goals_fp:
+            print("Skipping weekly goals - unchanged")
+            result["weekly_goals"] = existing_week.get("goals", [])
+            result["fingerprints"]["goals"] = goals_fp
         else:
-            print("TIMEOUT")
-
-    # Parse each day
+            calls.append({
+                "kind": "goals",
+                "label": "goals",
+                "fingerprint": goals_fp,
+                "text": sections["goals"],
+                "prompt": get_goals_prompt(sections["goals"]),
+                "schema": GOALS_SCHEMA,
+                "json_schema": GOALS_JSON_SCHEMA,
+                "timeout": 60
+            })
+
+    # Each day
     for day_name, day_text in sections["days"].items():
         if not day_text.strip():
             continue
@@ -251,52 +556,161 @@ def parse_journal_daily(
         date_str = get_date_for_day(day_name, year, week)
 
         # Check if we should skip this day (CDC logic)
+        fingerprint = fingerprint_text(day_text)
         force_this_day = force_days and day_name.lower() in [d.lower() for d in force_days]
-        already_exists = existing_entries and date_str in existing_entries
-
-        if already_exists and not force_this_day:
-            print(f"Skipping {day_name} ({date_str}) - already parsed")
+        existing = existing_entries.get(date_str) if existing_entries else None
+        unchanged = existing is not None and existing.get("fingerprint") == fingerprint
+        # Regex-parsed days only count as done when we're in hybrid mode
+        if unchanged and existing.get("parser") == "fallback" and not hybrid:
+            unchanged = False
+
+        if unchanged and not force_this_day:
+            print(f"Skipping {day_name} ({date_str}) - unchanged")
             # Copy existing data to result
-            result["days"][date_str] = existing_entries[date_str]
+            result["days"][date_str] = existing
             skipped += 1
             continue
 
-        print(f"Parsing {day_name} ({date_str})...", end=" ", flush=True)
+        if hybrid:
+            day_data = parse_day_section(day_text, day_name)
+            confidence = score_day_confidence(day_text, day_data)
+            if confidence >= confidence_threshold:
+                print(f"Regex parsed {day_name} ({date_str}) - confidence {confidence:.2f}")
+                result["days"][date_str] = {**day_data, "fingerprint": fingerprint}
+                regex_days += 1
+                continue
+            print(f"Sending {day_name} ({date_str}) to Ollama - confidence {confidence:.2f}")
+
+        pending_days.append({"day_name": day_name, "date": date_str, "text": day_text, "fingerprint": fingerprint})
+
+    for days in (plan_batches(pending_days) if batch else [[day] for day in pending_days]):
+        if len(days) == 1:
+            day = days[0]
+            calls.append({
+                "kind": "day",
+                "label": f"{day['day_name']} ({day['date']})",
+                "day_name": day["day_name"],
+                "date": day["date"],
+                "fingerprint": day["fingerprint"],
+                "text": day["text"],
+                "prompt": get_day_prompt(day["text"], day["date"], day["day_name"]),
+                "schema": DAY_SCHEMA,
+                "json_schema": DAY_JSON_SCHEMA,
+                "timeout": 90
+            })
+        else:
+            calls.append({
+                "kind": "batch",
+                "label": " + ".join(day["day_name"] for day in days),
+                "days": days,
+                "prompt": get_batch_prompt(days),
+                "schema": f"{{\"<date>\": {DAY_SCHEMA}, ...}}",
+                "json_schema": get_batch_json_schema([day["date"] for day in days]),
+                "options": {
+                    **OLLAMA_OPTIONS,
+                    "num_predict": min(BATCH_PREDICT_PER_DAY * len(days), BATCH_MAX_PREDICT)
+                },
+                "timeout": 90 + 30 * (len(days) - 1)
+            })
+
+    # Week review (re-parsed only when its text changed)
+    if sections["review"]:
+        review_fp = fingerprint_text(sections["review"])
+        if previous.get("review") == review_fp:
+            print("Skipping week review - unchanged")
+            result["week_review"] = existing_week.get("week_review", {})
+            result["fingerprints"]["review"] = review_fp
+        else:
+            calls.append({
+                "kind": "review",
+                "label": "week review",
+                "fingerprint": review_fp,
+                "text": sections["review"],
+                "prompt": get_review_prompt(sections["review"]),
+                "schema": REVIEW_SCHEMA,
+                "json_schema": REVIEW_JSON_SCHEMA,
+                "timeout": 60
+            })
+
+    start = time.time()
+    responses = run_prompts(calls, model, jobs, stream, week=f"{year}-W{week:02d}")
+    wall_time = time.time() - start
+    total_time = sum(elapsed for _, _, elapsed, _ in responses)
+    outcomes = [outcome for _, _, _, outcome in responses]
+    result["outcomes"] = {outcome: outcomes.count(outcome) for outcome in PARSE_OUTCOMES}
+    ollama_down = circuit_open()
+    fallbacks = 0
+
+    # Collect results in deterministic order: goals, days (Monday first), review
+    for call, (response, parsed, elapsed, _) in zip(calls, responses):
+        if call["kind"] == "goals":
+            print("Parsing weekly goals...", end=" ")
+        elif call["kind"] in ("day", "batch"):
+            print(f"Parsing {call['label']}...", end=" ")
+        else:
+            print("Parsing week review...", end=" ")
 
-        response, elapsed = call_ollama(get_day_prompt(day_text, date_str, day_name), model, timeout=90)
-        total_time += elapsed
+        if not response:
+            # No answer - parse this section with the regex parser instead
+            apply_fallback(call, result)
+            fallbacks += 1
+            print("FALLBACK (Ollama unavailable)" if ollama_down else "FALLBACK (no response)")
+            continue
 
-        if response:
-            day_data = extract_json(response)
-            if day_data:
-                result["days"][date_str] = {
-                    "day": day_name.capitalize(),
-                    **normalize_day_data(day_data)
-                }
+        if call["kind"] == "goals":
+            if isinstance(parsed, list):
+                result["weekly_goals"] = parsed
+                result["fingerprints"]["goals"] = call["fingerprint"]
+                print(f"OK ({elapsed:.1f}s) - {len(parsed)} goals")
+            else:
+                apply_fallback(call, result)
+                fallbacks += 1
+                print(f"OK ({elapsed:.1f}s) - couldn't parse, FALLBACK")
+        elif call["kind"] == "day":
+            if isinstance(parsed, dict):
+                result["days"][call["date"]] = make_day_record(call["day_name"], parsed, call["fingerprint"])
                 print(f"OK ({elapsed:.1f}s)")
             else:
-                print(f"OK ({elapsed:.1f}s) - couldn't parse JSON")
+                apply_fallback(call, result)
+                fallbacks += 1
+                print(f"OK ({elapsed:.1f}s) - couldn't parse JSON, FALLBACK")
+        elif call["kind"] == "batch":
+            by_date = parsed if isinstance(parsed, dict) else {}
+            missing = []
+            for day in call["days"]:
+                day_data = by_date.get(day["date"])
+                if isinstance(day_data, dict):
+                    result["days"][day["date"]] = make_day_record(day["day_name"], day_data, day["fingerprint"])
+                else:
+                    result["days"][day["date"]] = parse_day_section(day["text"], day["day_name"])
+                    missing.append(day["day_name"])
+            if missing:
+                fallbacks += 1
+                print(f"OK ({elapsed:.1f}s) - missing {', '.join(missing)}, FALLBACK")
+            else:
+                print(f"OK ({elapsed:.1f}s) - {len(call['days'])} days")
         else:
-            print("TIMEOUT")
-
-    # Parse week review (always, might change)
-    if sections["review"]:
-        print("Parsing week review...", end=" ", flush=True)
-        response, elapsed = call_ollama(get_review_prompt(sections["review"]), model, timeout=60)
-        total_time += elapsed
-        if response:
-            review = extract_json(response)
-            if isinstance(review, dict):
-                result["week_review"] = review
+            if isinstance(parsed, dict):
+                result["week_review"] = parsed
+                result["fingerprints"]["review"] = call["fingerprint"]
                 print(f"OK ({elapsed:.1f}s)")
             else:
-                print(f"OK ({elapsed:.1f}s) - couldn't parse")
-        else:
-            print("TIMEOUT")
+                apply_fallback(call, result)
+                fallbacks += 1
+                print(f"OK ({elapsed:.1f}s) - couldn't parse, FALLBACK")
+
+    result["days"] = dict(sorted(result["days"].items()))
 
     print("=" * 50)
     parsed_count = len(result['days']) - skipped
-    print(f"Total: {total_time:.1f}s | Parsed: {parsed_count} days | Skipped: {skipped} days")
+    print(f"Total: {total_time:.1f}s in calls, {wall_time:.1f}s wall | Parsed: {parsed_count} days | Skipped: {skipped} days")
+    if hybrid:
+        print(f"Hybrid: {regex_days} days regex-parsed, {len(pending_days)} sent to Ollama")
+    print(f"Outputs: {outcomes.count('first_try_valid')} valid first try | {outcomes.count('repaired')} repaired | "
+          f"{outcomes.count('dropped')} dropped | {outcomes.count('no_response')} no response")
+    if fallbacks:
+        reason = "Ollama circuit open" if ollama_down else "No usable Ollama output"
+        print(f"{reason}: {fallbacks} sections parsed with the regex fallback")
 
     return result
 
@@ -312,11 +726,26 @@ def load_existing_entries(data_dir: Path) -> dict:
     return {}
 
 
+def load_existing_week(data_dir: Path, week_id: str) -> Optional[dict]:
+    """Load this week's record from weeks.json if it exists."""
+    weeks_file = data_dir / "weeks.json"
+    if weeks_file.exists():
+        try:
+            return json.loads(weeks_file.read_text(encoding="utf-8")).get(week_id)
+        except json.JSONDecodeError:
+            return None
+    return None
+
+
 def parse_journal_file(
     filepath: Path,
     model: str = "mistral",
     incremental: bool = True,
-    force_days: Optional[list] = None
+    force_days: Optional[list] = None,
+    jobs: int = 1,
+    stream: bool = True,
+    batch: bool = False,
+    hybrid: bool = False
 ) -> Optional[dict]:
     """
     Parse a journal file from disk using day-by-day processing.
@@ -324,8 +753,12 @@ def parse_journal_file(
     Args:
         filepath: Path to journal markdown file
         model: Ollama model to use
-        incremental: If True, skip days already in entries.json (CDC mode)
+        incremental: If True, skip days unchanged since they were parsed into entries.json (CDC mode)
         force_days: List of day names to force re-parse even if they exist
+        jobs: Number of prompts to send to Ollama concurrently
+        stream: Stream responses and stop each generation once its JSON is complete
+        batch: Pack several short days into one prompt
+        hybrid: Regex-parse first and only send low-confidence days to Ollama
     """
     if not filepath.exists():
         print(f"File not found: {filepath}")
@@ -333,9 +766,11 @@ def parse_journal_file(
 
     # Load existing entries for CDC mode
     existing = None
+    existing_week = None
     if incremental:
         data_dir = filepath.parent.parent / "data"
         existing = load_existing_entries(data_dir)
+        existing_week = load_existing_week(data_dir, filepath.stem)
         if existing:
             print(f"Loaded {len(existing)} existing entries (CDC mode)")
 
@@ -345,7 +780,12 @@ def parse_journal_file(
         filepath.name,
         model,
         existing_entries=existing,
-        force_days=force_days
+        force_days=force_days,
+        jobs=jobs,
+        stream=stream,
+        batch=batch,
+        existing_week=existing_week,
+        hybrid=hybrid
     )
 
 
@@ -357,18 +797,42 @@ if __name__ == "__main__":
     filepath = None
     force_days = []
     full_parse = False
+    jobs = None
+    stream = True
+    batch = False
+    hybrid = False
 
-    for arg in args:
+    args_iter = iter(args)
+    for arg in args_iter:
         if arg == "--full":
             full_parse = True
         elif arg.startswith("--force="):
             # e.g., --force=Thursday,Friday
             force_days = arg.split("=")[1].split(",")
+        elif arg == "--batch":
+            batch = True
+        elif arg == "--hybrid":
+            hybrid = True
+        elif arg == "--no-stream":
+            stream = False
+        elif arg == "--no-llm-cache":
+            llm_cache.configure(enabled=False)
+        elif arg.startswith("--jobs="):
+            # e.g., --jobs=3 to send up to 3 prompts to Ollama at once
+            jobs = max(1, int(arg.split("=")[1]))
+        elif arg in ("--jobs", "-j"):
+            # e.g., --jobs 3 or -j 3, as sync.py takes it
+            value = next(args_iter, None)
+            if value is None:
+                sys.exit(f"{arg} needs a number")
+            jobs = max(1, int(value))
         elif not arg.startswith("-"):
             filepath = Path(arg)
 
     if not filepath:
         filepath = Path(__file__).parent.parent / "weeks" / "2025-W02.md"
+    if jobs is None:
+        jobs = capacity()
 
     print(f"File: {filepath}")
     if force_days:
@@ -379,12 +843,27 @@ if __name__ == "__main__":
         print("Mode: Incremental (CDC)")
     print()
 
+    telemetry.start_run()
+    warm = warm_up()
+    if warm:
+        print(f"Model cold start: {warm['cold']:.1f}s (load {warm['load']:.1f}s), warm call: {warm['warm']:.2f}s")
+        print()
+
     result = parse_journal_file(
         filepath,
         incremental=not full_parse,
-        force_days=force_days if force_days else None
+        force_days=force_days if force_days else None,
+        jobs=jobs,
+        stream=stream,
+        batch=batch,
+        hybrid=hybrid
     )
 
+    print(llm_cache.format_stats())
+    if result:
+        print(format_parse_outcomes(result["outcomes"]))
+    print(telemetry.format_summary())
+
     if result:
         print("\n" + "=" * 50)
         print("PARSED RESULT:")
@@ -0,0 +1,248 @@
+"""
+Single-pass section tokenizer for journal markdown.
+Indexes the goals, days, ## subsections and week review of a journal as
+offsets into the original text, so both parsers can slice out what they
+need without re-scanning the document with regexes.
+"""
+
+import itertools
+import re
+from typing import Optional
+
+# The only lines the scan stops at: headings ("# Monday, January 6",
+# "## Practice", "##notes") and "---" rules
+MARKER = r'(?:(?P<hashes>#+)(?P<space>[ \t]*)(?P<title>[^\n]*)|(?P<rule>---))'
+MARKER_RE = re.compile('^' + MARKER, re.MULTILINE)
+# The first line after a BOM, which "^" won't match at
+FIRST_MARKER_RE = re.compile(MARKER)
+# Start of a top-level heading line ("#tag" isn't one)
+TOP_HEADING_RE = re.compile(r'#[ \t]')
+DAY_TITLE_RE = re.compile(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(\w+)\s+(\d+)', re.IGNORECASE)
+GOALS_TITLES = ("goal", "goals")
+REVIEW_TITLE = "week-review"
+
+
+class SectionIndex:
+    """
+    Offsets of a journal's sections, built in one pass over its heading lines.
+
+    Top-level "# " headings split the document into sections (the text
+    before the first one is a preamble section with no title). Each
+    section is a dict:
+        kind         "week" (# Week of ...), "day", "review" or "other"
+        title        heading text, e.g. "Monday, January 6"
+        start        offset of the heading line
+        body_start   offset just after the heading line
+        end          offset of the next top-level heading (or len(text))
+        subsections  [{"name", "start", "body_start", "end"}] for ## (and
+                     deeper) headings, each ending at the next heading
+    Day sections also carry "name" (as written), "date_end" (offset just
+    after the day number in the heading) and "content_end" (where the day's
+    own text stops: the section end, or a "## week-review" heading inside it).
+
+    goals and review are (start, end) spans of the first goals / week-review
+    body, or None. Goals stop at the first "---" rule.
+
+    A heading with nothing under it (or directly followed by another
+    heading) has an empty body. The per-subsection regexes this replaces
+    gave it the next heading and that heading's body instead, so an empty
+    "## notes" above "## exploring" came out as notes reading "## exploring
+    ..."; journals where every heading has a body split the same as before.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sections = []
+        self.goals = None
+        self.review = None
+        self._scan()
+
+    def _scan(self):
+        text = self.text
+        n = len(text)
+        start = 1 if text.startswith("\ufeff") else 0
+        current = self._open_section(None, start, start)
+        rules = []      # Offsets of "---" lines
+        last_sub = None
+
+        markers = MARKER_RE.finditer(text, start)
+        if start:
+            first = FIRST_MARKER_RE.match(text, start)
+            markers = itertools.chain([first] if first else [], markers)
+
+        for match in markers:
+            pos = match.start()
+            if match.group("rule"):
+                rules.append(pos)
+                continue
+            hashes, space, title = match.group("hashes", "space", "title")
+            level = len(hashes)
+            # "#tag" isn't a heading; "##practice" is
+            if level == 1 and not space:
+                continue
+            title = title.rstrip()
+            body_start = min(match.end() + 1, n)
+            if last_sub is not None:
+                last_sub["end"] = pos
+                last_sub = None
+            if level == 1:
+                current["end"] = pos
+                current = self._open_section(title, pos, body_start)
+                current["title_start"] = match.start("title")
+            else:
+                last_sub = {"name": title.lower(), "start": pos, "body_start": body_start, "end": n}
+                current["subsections"].append(last_sub)
+
+        current["end"] = n
+        if last_sub is not None:
+            last_sub["end"] = n
+        self._classify(rules)
+
+    def _open_section(self, title: Optional[str], start: int, body_start: int) -> dict:
+        section = {
+            "kind": "other",
+            "title": title,
+            "start": start,
+            "body_start": min(body_start, len(self.text)),
+            "end": len(self.text),
+            "subsections": []
+        }
+        self.sections.append(section)
+        return section
+
+    def _classify(self, rules: list[int]):
+        rule_iter = iter(rules)
+        next_rule = next(rule_iter, None)
+
+        for section in self.sections:
+            title = section["title"]
+            title_start = section.pop("title_start", None)
+            if title is not None:
+                day = DAY_TITLE_RE.match(title)
+                if title.startswith("Week of"):
+                    section["kind"] = "week"
+                elif day:
+                    section["kind"] = "day"
+                    section["name"] = day.group(1)
+                    section["date_end"] = title_start + day.end()
+                    section["content_end"] = section["end"]
+                elif REVIEW_TITLE in title.lower():
+                    section["kind"] = "review"
+                    if self.review is None:
+                        self.review = (section["body_start"], section["end"])
+
+            for sub in section["subsections"]:
+                if sub["name"] in GOALS_TITLES and self.goals is None and section["kind"] != "day":
+                    # Goals stop at the first --- rule after the heading
+                    while next_rule is not None and next_rule < sub["body_start"]:
+                        next_rule = next(rule_iter, None)
+                    end = sub["end"] if next_rule is None else min(sub["end"], next_rule)
+                    self.goals = (sub["body_start"], max(sub["body_start"], end))
+                elif sub["name"] == REVIEW_TITLE:
+                    if section["kind"] == "day" and section["content_end"] == section["end"]:
+                        section["content_end"] = sub["start"]
+                    if self.review is None:
+                        self.review = (sub["body_start"], section["end"])
+
+    @property
+    def days(self) -> list[dict]:
+        return [section for section in self.sections if section["kind"] == "day"]
+
+    def slice(self, span: Optional[tuple]) -> str:
+        """Text of a (start, end) span; "" for None."""
+        if span is None:
+            return ""
+        return self.text[span[0]:span[1]]
+
+    def subsections(self, section: dict) -> dict[str, str]:
+        """Map of subsection name to body text (first occurrence of each name wins)."""
+        found = {}
+        for sub in section["subsections"]:
+            if sub["name"] not in found:
+                found[sub["name"]] = self.text[sub["body_start"]:sub["end"]]
+        return found
+
+
+def index_journal(text: str) -> SectionIndex:
+    """Tokenize a journal into a SectionIndex."""
+    return SectionIndex(text)
+
+
+def find_subsections(text: str) -> dict[str, str]:
+    """Subsection bodies of a single day's text (first occurrence of each name wins)."""
+    index = SectionIndex(text)
+    found = {}
+    for section in index.sections:
+        for name, body in index.subsections(section).items():
+            found.setdefault(name, body)
+    return found
+
+
+def _same(old: str, new: str) -> bool:
+    # Only surrounding whitespace is ignored: notes and exploring keep their inner layout
+    return old.strip() == new.strip()
+
+
+def _lead_text(index: SectionIndex, day: dict) -> str:
+    """A day's text before its first ## subsection."""
+    end = day["subsections"][0]["start"] if day["subsections"] else day["end"]
+    return index.text[day["body_start"]:end]
+
+
+def diff_journals(old_text: str, new_text: str) -> dict:
+    """
+    Compare two exports of the same week section by section.
+
+    Returns:
+        {
+            "goals": True if the goals changed,
+            "review": True if the week review changed,
+            "days": {"Monday": None, "Tuesday": {"reading"}, ...}
+        }
+    Only changed days are listed: None means the whole day is new or its
+    text outside any ## subsection changed, otherwise the set holds the
+    names of the subsections that were added, removed or edited.
+    """
+    old = SectionIndex(old_text)
+    new = SectionIndex(new_text)
+    old_days = {day["name"].capitalize(): day for day in old.days}
+
+    changes = {
+        "goals": not _same(old.slice(old.goals), new.slice(new.goals)),
+        "review": not _same(old.slice(old.review), new.slice(new.review)),
+        "days": {}
+    }
+
+    for day in new.days:
+        name = day["name"].capitalize()
+        previous = old_days.get(name)
+        if previous is None:
+            changes["days"][name] = None
+            continue
+
+        if not _same(_lead_text(old, previous), _lead_text(new, day)):
+            changes["days"][name] = None
+            continue
+
+        new_subs = new.subsections(day)
+        old_subs = old.subsections(previous)
+        changed = {
+            sub for sub in new_subs.keys() | old_subs.keys()
+            if (sub in new_subs) != (sub in old_subs) or not _same(old_subs.get(sub, ""), new_subs.get(sub, ""))
+        }
+        if changed:
+            changes["days"][name] = changed
+
+    return changes
+
+
+def format_journal_diff(changes: dict) -> str:
+    """One-line summary of diff_journals output for logging."""
+    parts = []
+    if changes["goals"]:
+        parts.append("goals")
+    for name, subsections in changes["days"].items():
+        parts.append(name if subsections is None else f"{name} ({', '.join(sorted(subsections))})")
+    if changes["review"]:
+        parts.append("review")
+    return ", ".join(parts) if parts else "nothing"
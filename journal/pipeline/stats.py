@@ -3,12 +3,20 @@ Stats Computation Module.
 Takes parsed journal entries and books config to compute comprehensive statistics.
 """
 
+import hashlib
 import json
-from collections import defaultdict
-from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+try:
+    from .dateindex import DATES, WeekIndex, streaks
+    from .intervals import IntervalSet
+except ImportError:
+    from dateindex import DATES, WeekIndex, streaks
+    from intervals import IntervalSet
+
 
 def load_books_config(config_path: Path) -> dict:
     """Load the books configuration file."""
@@ -35,58 +43,9 @@ def calculate_streak(dates: list[str], reference_date: Optional[str] = None) ->
     Returns:
         Tuple of (current_streak, longest_streak)
     """
-    if not dates:
-        return 0, 0
-
-    # Convert to datetime and sort
-    date_set = set()
-    for d in dates:
-        try:
-            date_set.add(datetime.strptime(d, "%Y-%m-%d").date())
-        except ValueError:
-            continue
-
-    if not date_set:
-        return 0, 0
-
-    sorted_dates = sorted(date_set)
-
-    # Calculate longest streak
-    longest = 1
-    current = 1
-    for i in range(1, len(sorted_dates)):
-        if (sorted_dates[i] - sorted_dates[i-1]).days == 1:
-            current += 1
-            longest = max(longest, current)
-        else:
-            current = 1
-
-    # Calculate current streak (from reference date backwards)
-    if reference_date:
-        ref = datetime.strptime(reference_date, "%Y-%m-%d").date()
-    else:
-        ref = datetime.now().date()
-
-    # Current streak: consecutive days ending at or before reference date
-    current_streak = 0
-    check_date = ref
-
-    # Allow for "today or yesterday" to count as current
-    while check_date in date_set or (check_date + timedelta(days=1)) in date_set:
-        if check_date in date_set:
-            current_streak += 1
-            check_date -= timedelta(days=1)
-        elif (check_date + timedelta(days=1)) in date_set:
-            # Started yesterday, adjust
-            check_date = check_date + timedelta(days=1)
-            while check_date in date_set:
-                current_streak += 1
-                check_date -= timedelta(days=1)
-            break
-        else:
-            break
-
-    return current_streak, longest
+    runs = DATES.runs(dates)
+    as_of = datetime.strptime(reference_date, "%Y-%m-%d").toordinal() if reference_date else None
+    return streaks(runs, as_of)
 
 
 def compute_practice_stats(entries: dict) -> dict:
@@ -107,7 +66,7 @@ def compute_practice_stats(entries: dict) -> dict:
             stats["leetcode"]["dates"].append(date)
             for problem in lc:
                 stats["leetcode"]["total"] += 1
-                difficulty = problem.get("difficulty", "").lower()
+                difficulty = (problem.get("difficulty") or "").lower()
                 if difficulty in ["easy", "medium", "hard"]:
                     stats["leetcode"][difficulty] += 1
 
@@ -151,7 +110,7 @@ def compute_reading_stats(entries: dict, books_config: dict) -> dict:
 
     # Track pages read and chapters for each book
     book_data = defaultdict(lambda: {
-        "pages_read_set": set(),
+        "pages_read": IntervalSet(),
         "chapters_touched": set(),
         "themes_covered": set()
     })
@@ -165,10 +124,9 @@ def compute_reading_stats(entries: dict, books_config: dict) -> dict:
             chapter = reading_entry.get("chapter")
             pages = reading_entry.get("pages")
 
-            if pages and len(pages) == 2:
-                # Add all pages in range
-                for p in range(pages[0], pages[1] + 1):
-                    book_data[book_key]["pages_read_set"].add(p)
+            # An empty range adds no pages, so it doesn't record the book either
+            if pages and len(pages) == 2 and pages[0] <= pages[1]:
+                book_data[book_key]["pages_read"].add(pages[0], pages[1])
 
             if chapter:
                 book_data[book_key]["chapters_touched"].add(chapter)
@@ -182,32 +140,49 @@ def compute_reading_stats(entries: dict, books_config: dict) -> dict:
 
     # Compute final stats per book
     for book_key, data in book_data.items():
-        config = books_config.get(book_key, {})
-        total_pages = config.get("total_pages", 0)
-
-        # Calculate pages read (distinct pages)
-        pages_read = len(data["pages_read_set"])
-
-        # Determine completed chapters
-        chapters_completed = []
-        for ch_num, ch_config in config.get("chapters", {}).items():
-            ch_pages = ch_config.get("pages", [0, 0])
-            if ch_pages:
-                ch_page_set = set(range(ch_pages[0], ch_pages[1] + 1))
-                if ch_page_set.issubset(data["pages_read_set"]):
-                    chapters_completed.append(int(ch_num))
-
-        reading_stats[book_key] = {
-            "pages_read": pages_read,
-            "total_pages": total_pages,
-            "percentage": round((pages_read / total_pages * 100) if total_pages > 0 else 0, 1),
-            "chapters_completed": sorted(chapters_completed),
-            "themes_covered": sorted(list(data["themes_covered"]))
-        }
+        reading_stats[book_key] = summarize_book(
+            data["pages_read"], data["themes_covered"], books_config.get(book_key, {})
+        )
 
     return reading_stats
 
 
+def summarize_book(pages_read: IntervalSet, themes_covered: set, config: dict) -> dict:
+    """Progress for one book from the pages read and themes covered."""
+    total_pages = config.get("total_pages", 0)
+
+    # Determine completed chapters: every page of the chapter was read
+    chapters_completed = []
+    for ch_num, ch_config in config.get("chapters", {}).items():
+        ch_pages = ch_config.get("pages", [0, 0])
+        if ch_pages and pages_read.covers(ch_pages[0], ch_pages[1]):
+            chapters_completed.append(int(ch_num))
+
+    # Distinct pages
+    pages_read = len(pages_read)
+
+    return {
+        "pages_read": pages_read,
+        "total_pages": total_pages,
+        "percentage": round((pages_read / total_pages * 100) if total_pages > 0 else 0, 1),
+        "chapters_completed": sorted(chapters_completed),
+        "themes_covered": sorted(list(themes_covered))
+    }
+
+
+def chapter_coverage(pages_read: IntervalSet, config: dict) -> dict:
+    """Percentage of each configured chapter's pages read, by chapter number."""
+    coverage = {}
+    for ch_num, ch_config in config.get("chapters", {}).items():
+        ch_pages = ch_config.get("pages", [0, 0])
+        if not ch_pages:
+            continue
+        length = ch_pages[1] - ch_pages[0] + 1
+        read = pages_read.overlap(ch_pages[0], ch_pages[1])
+        coverage[int(ch_num)] = round(read / length * 100, 1) if length > 0 else 100.0
+    return coverage
+
+
 def compute_building_stats(entries: dict) -> dict:
     """Compute project building statistics."""
     projects = defaultdict(lambda: {"days_worked": 0, "dates": []})
@@ -278,22 +253,24 @@ def compute_goals_stats(weeks_data: dict) -> dict:
     }
 
 
-def compute_all_stats(entries: dict, weeks: dict, books_config: dict) -> dict:
-    """Compute all statistics."""
-
-    # Update current week percentage
+def compute_goals_summary(weeks: dict) -> dict:
+    """Goals stats with the current week's percentage filled in."""
     goals_stats = compute_goals_stats(weeks)
     if goals_stats["current_week"]["total"] > 0:
         goals_stats["current_week"]["percentage"] = round(
             goals_stats["current_week"]["completed"] / goals_stats["current_week"]["total"] * 100, 1
         )
+    return goals_stats
+
 
+def compute_all_stats(entries: dict, weeks: dict, books_config: dict) -> dict:
+    """Compute all statistics."""
     return {
         "practice": compute_practice_stats(entries),
         "reading": compute_reading_stats(entries, books_config),
         "building": compute_building_stats(entries),
         "exploring": compute_exploring_stats(entries),
-        "goals": goals_stats
+        "goals": compute_goals_summary(weeks)
     }
 
 
@@ -307,21 +284,346 @@ def merge_entries(existing: dict, new_parsed: dict) -> dict:
     return merged
 
 
-def get_week_activity_counts(entries: dict, week_id: str) -> dict:
-    """Get activity counts for a specific week."""
-    import re
+def merge_entries_with_delta(existing: dict, new_parsed: dict) -> tuple[dict, dict]:
+    """
+    Merge like merge_entries and also report what the merge changed:
+        {"added": {date: day}, "changed": {date: (old_day, new_day)}, "removed": {date: day}}
 
-    year, week_num = int(week_id[:4]), int(week_id[-2:])
-    week_entries = {}
-    for date, data in entries.items():
-        try:
-            entry_date = datetime.strptime(date, "%Y-%m-%d")
-            entry_week = entry_date.isocalendar()[1]
-            entry_year = entry_date.isocalendar()[0]
-            if entry_year == year and entry_week == week_num:
-                week_entries[date] = data
-        except:
+    Days equal to the stored record are left out. Merging never drops a
+    date, so "removed" is always empty here; StatsAggregate.apply takes it
+    for callers that do delete days.
+    """
+    merged = existing.copy()
+    delta = {"added": {}, "changed": {}, "removed": {}}
+
+    for date, day_data in new_parsed.get("days", {}).items():
+        if date not in merged:
+            delta["added"][date] = day_data
+        elif merged[date] != day_data:
+            delta["changed"][date] = (merged[date], day_data)
+        merged[date] = day_data
+
+    return merged, delta
+
+
+# Practice categories and the per-kind counters compute_practice_stats keeps for each
+PRACTICE_COUNTERS = {
+    "leetcode": ("easy", "medium", "hard"),
+    "sql": (),
+    "system_design": ("hld", "lld"),
+    "ml": (),
+}
+
+
+def day_contributions(day_data: dict) -> dict:
+    """
+    What one day adds to the stats: counts for each non-empty practice
+    category, plus page ranges and chapters per book, entries per project
+    and per exploring topic, each in the order they first appear in the day.
+    """
+    practice = {}
+    day_practice = day_data.get("practice", {})
+
+    lc = day_practice.get("leetcode", [])
+    if lc:
+        counts = {"total": len(lc), "easy": 0, "medium": 0, "hard": 0}
+        for problem in lc:
+            difficulty = (problem.get("difficulty") or "").lower()
+            if difficulty in ["easy", "medium", "hard"]:
+                counts[difficulty] += 1
+        practice["leetcode"] = counts
+
+    sql = day_practice.get("sql", [])
+    if sql:
+        practice["sql"] = {"total": len(sql)}
+
+    sd = day_practice.get("system_design", [])
+    if sd:
+        counts = {"total": len(sd), "hld": 0, "lld": 0}
+        for item in sd:
+            design_type = (item.get("type") or "").upper()
+            if design_type in ("HLD", "LLD"):
+                counts[design_type.lower()] += 1
+        practice["system_design"] = counts
+
+    ml = day_practice.get("ml", [])
+    if ml:
+        practice["ml"] = {"total": len(ml)}
+
+    books = {}
+    for reading_entry in day_data.get("reading", []):
+        book_key = reading_entry.get("book", "")
+        if not book_key:
             continue
+        chapter = reading_entry.get("chapter")
+        pages = reading_entry.get("pages")
+        # compute_reading_stats only records a book once it has a page or a chapter
+        if pages and len(pages) == 2 and pages[0] <= pages[1]:
+            books.setdefault(book_key, {"ranges": [], "chapters": []})["ranges"].append((pages[0], pages[1]))
+        if chapter:
+            books.setdefault(book_key, {"ranges": [], "chapters": []})["chapters"].append(chapter)
+
+    projects = Counter(building.get("project", "Unknown") for building in day_data.get("building", []))
+    topics = Counter(exploring.get("topic", "misc") for exploring in day_data.get("exploring", []))
+
+    return {"practice": practice, "books": books, "projects": projects, "topics": topics}
+
+
+class StatsAggregate:
+    """
+    The running totals behind compute_all_stats, kept up to date from the
+    deltas merge_entries_with_delta reports instead of rebuilt from every
+    entry on each sync.
+
+    Each day's day_contributions are added when it appears and subtracted
+    when it goes, and a changed day is both, so the work per sync follows
+    the days that changed. Dates, page ranges and chapters are reference
+    counted so that removing one day keeps what other days still
+    contribute. Books, projects and topics come out in the order
+    compute_all_stats finds them in: by the first entry that mentions them.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self.positions = {}         # date -> position in entries
+        self.next_position = 0
+        self.practice = {
+            category: {"total": 0, **{counter: 0 for counter in counters}, "dates": set()}
+            for category, counters in PRACTICE_COUNTERS.items()
+        }
+        # key -> totals plus "seen" {date: slot in that day}, "first" (position, slot)
+        # of the earliest mention, and for projects the "last" date; None means recompute
+        self.books = {}
+        self.projects = {}
+        self.topics = {}
+        # category -> runs of active day ordinals, built on first use and then kept in step
+        self._runs = {}
+        # The entries' dates by ISO week, for week lookups during a sync
+        self.week_index = WeekIndex()
+
+    @classmethod
+    def from_entries(cls, entries: dict) -> "StatsAggregate":
+        """Build the aggregate from scratch, as compute_all_stats would see entries."""
+        aggregate = cls()
+        aggregate.apply({"added": entries})
+        return aggregate
+
+    def apply(self, delta: dict):
+        """Fold in a merge_entries_with_delta delta."""
+        for date, day_data in delta.get("removed", {}).items():
+            self._contribute(date, day_data, -1)
+            del self.positions[date]
+            self.week_index.discard(date)
+        for date, (old_day, new_day) in delta.get("changed", {}).items():
+            self._contribute(date, old_day, -1)
+            self._contribute(date, new_day, 1)
+        for date, day_data in delta.get("added", {}).items():
+            self.positions[date] = self.next_position
+            self.next_position += 1
+            self._contribute(date, day_data, 1)
+            self.week_index.add(date)
+
+    def revert(self, delta: dict):
+        """Undo apply(delta), e.g. when the rest of a week's sync fails."""
+        self.apply({
+            "added": delta.get("removed", {}),
+            "changed": {date: (new_day, old_day) for date, (old_day, new_day) in delta.get("changed", {}).items()},
+            "removed": delta.get("added", {}),
+        })
+
+    def _contribute(self, date: str, day_data: dict, sign: int):
+        contributions = day_contributions(day_data)
+
+        for category, counts in contributions["practice"].items():
+            totals = self.practice[category]
+            for counter, count in counts.items():
+                totals[counter] += sign * count
+            if sign > 0:
+                totals["dates"].add(date)
+            else:
+                totals["dates"].discard(date)
+            runs = self._runs.get(category)
+            ordinal = DATES.ordinal(date)
+            if runs is not None and ordinal is not None:
+                if sign > 0:
+                    runs.add(ordinal, ordinal)
+                else:
+                    runs.discard(ordinal)
+
+        for slot, (book_key, book) in enumerate(contributions["books"].items()):
+            record = self._touch(self.books, book_key, date, slot, sign, {"ranges": Counter(), "chapters": Counter()})
+            record["ranges"].update({pages: sign * count for pages, count in Counter(book["ranges"]).items()})
+            record["chapters"].update({chapter: sign * count for chapter, count in Counter(book["chapters"]).items()})
+            record["ranges"] = +record["ranges"]
+            record["chapters"] = +record["chapters"]
+
+        for slot, (project, count) in enumerate(contributions["projects"].items()):
+            record = self._touch(self.projects, project, date, slot, sign, {"days_worked": 0, "last": date})
+            record["days_worked"] += sign * count
+            if sign > 0 and record["last"] is not None and date > record["last"]:
+                record["last"] = date
+            elif sign < 0 and record["last"] == date:
+                record["last"] = None
+
+        for slot, (topic, count) in enumerate(contributions["topics"].items()):
+            record = self._touch(self.topics, topic, date, slot, sign, {"count": 0})
+            record["count"] += sign * count
+
+    def _touch(self, records: dict, key, date: str, slot: int, sign: int, empty: dict) -> dict:
+        """The record for key, with date's mention added or removed (and dropped once unmentioned)."""
+        mention = (self.positions[date], slot)
+        record = records.get(key)
+        if record is None:
+            record = records[key] = {**empty, "seen": {}, "first": mention}
+        if sign > 0:
+            record["seen"][date] = slot
+            if record["first"] is not None and mention < record["first"]:
+                record["first"] = mention
+        else:
+            del record["seen"][date]
+            if not record["seen"]:
+                del records[key]
+            elif record["first"] == mention:
+                record["first"] = None
+        return record
+
+    def _ordered(self, records: dict) -> list:
+        """Keys in order of their first mention, recomputing any invalidated by a removal."""
+        for record in records.values():
+            if record["first"] is None:
+                record["first"] = min((self.positions[date], slot) for date, slot in record["seen"].items())
+        return sorted(records, key=lambda key: records[key]["first"])
+
+    def compute(self, weeks: dict, books_config: dict) -> dict:
+        """The same result as compute_all_stats(entries, weeks, books_config)."""
+        practice = {}
+        for category, totals in self.practice.items():
+            practice[category] = {counter: count for counter, count in totals.items() if counter != "dates"}
+            if category not in self._runs:
+                self._runs[category] = DATES.runs(totals["dates"])
+            current, longest = streaks(self._runs[category])
+            practice[category]["current_streak"] = current
+            practice[category]["longest_streak"] = longest
+
+        reading = {}
+        for book_key in self._ordered(self.books):
+            record = self.books[book_key]
+            pages_read = IntervalSet(record["ranges"])
+            themes_covered = set()
+            if book_key in books_config:
+                chapters = books_config[book_key].get("chapters", {})
+                for chapter in record["chapters"]:
+                    themes_covered.update(chapters.get(str(chapter), {}).get("themes", []))
+            reading[book_key] = summarize_book(pages_read, themes_covered, books_config.get(book_key, {}))
+
+        projects = {}
+        for project in self._ordered(self.projects):
+            record = self.projects[project]
+            if record["last"] is None:
+                record["last"] = max(record["seen"])
+            projects[project] = {"days_worked": record["days_worked"], "last_active": record["last"]}
+
+        return {
+            "practice": practice,
+            "reading": reading,
+            "building": {"projects": projects},
+            "exploring": {"topics": {topic: self.topics[topic]["count"] for topic in self._ordered(self.topics)}},
+            "goals": compute_goals_summary(weeks)
+        }
+
+    def to_json(self) -> dict:
+        """A JSON-safe snapshot; keys are kept as [key, record] pairs so non-string keys survive."""
+        def pairs(counter: Counter) -> list:
+            return [[key, count] for key, count in counter.items()]
+
+        return {
+            "version": self.VERSION,
+            "positions": self.positions,
+            "next_position": self.next_position,
+            "practice": {
+                category: {**totals, "dates": sorted(totals["dates"])}
+                for category, totals in self.practice.items()
+            },
+            "books": [
+                [key, {**record, "ranges": [[*pages, count] for pages, count in record["ranges"].items()],
+                       "chapters": pairs(record["chapters"])}]
+                for key, record in self.books.items()
+            ],
+            "projects": [[key, record] for key, record in self.projects.items()],
+            "topics": [[key, record] for key, record in self.topics.items()],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "StatsAggregate":
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"Unsupported stats state version: {data.get('version')}")
+
+        def first(record: dict) -> dict:
+            if record["first"] is not None:
+                record["first"] = tuple(record["first"])
+            return record
+
+        aggregate = cls()
+        aggregate.positions = data["positions"]
+        aggregate.next_position = data["next_position"]
+        aggregate.week_index = WeekIndex(aggregate.positions)
+        for category, totals in data["practice"].items():
+            aggregate.practice[category] = {**totals, "dates": set(totals["dates"])}
+        for key, record in data["books"]:
+            record["ranges"] = Counter({(start, end): count for start, end, count in record["ranges"]})
+            record["chapters"] = Counter({chapter: count for chapter, count in record["chapters"]})
+            aggregate.books[key] = first(record)
+        for key, record in data["projects"]:
+            aggregate.projects[key] = first(record)
+        for key, record in data["topics"]:
+            aggregate.topics[key] = first(record)
+        return aggregate
+
+
+def entries_digest(entries_path: Path) -> Optional[str]:
+    """SHA-1 of entries.json as saved, or None if it doesn't exist."""
+    if not entries_path.exists():
+        return None
+    return hashlib.sha1(entries_path.read_bytes()).hexdigest()
+
+
+def load_stats_state(state_path: Path, entries_path: Path, entries: dict) -> StatsAggregate:
+    """
+    Load the saved StatsAggregate if it was saved with the entries.json on
+    disk now; otherwise (first run, or entries.json written by something
+    else) rebuild it from entries.
+    """
+    if state_path.exists():
+        try:
+            data = json.loads(state_path.read_text(encoding="utf-8"))
+            if data.get("entries_digest") == entries_digest(entries_path):
+                return StatsAggregate.from_json(data)
+        except (ValueError, KeyError, TypeError):
+            pass
+    return StatsAggregate.from_entries(entries)
+
+
+def save_stats_state(aggregate: StatsAggregate, state_path: Path, entries_path: Path):
+    """Save the aggregate, tied to the entries.json it matches."""
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    data = aggregate.to_json()
+    data["entries_digest"] = entries_digest(entries_path)
+    state_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def get_week_activity_counts(entries: dict, week_id: str, week_index: Optional[WeekIndex] = None) -> dict:
+    """
+    Get activity counts for a specific week.
+
+    With a WeekIndex kept in step with entries, only the week's own days
+    are looked at; without one, every entry is checked.
+    """
+    year, week_num = int(week_id[:4]), int(week_id[-2:])
+    if week_index is not None:
+        week_entries = {date: entries[date] for date in week_index.dates(year, week_num)}
+    else:
+        week_entries = {date: data for date, data in entries.items() if DATES.iso_week(date) == (year, week_num)}
 
     counts = {
         "leetcode": 0,
@@ -440,29 +742,29 @@ def detect_goal_progress(goal: str, counts: dict) -> dict:
     return {"current": 0, "target": 1, "completed": False, "type": "unknown"}
 
 
-def compute_goals_progress(goals: list, entries: dict, week_id: str) -> list:
+def goal_progress(goals: list, counts: dict) -> list:
+    """Progress of each goal against a week's activity counts (see get_week_activity_counts)."""
+    return [{**detect_goal_progress(goal, counts), "goal": goal} for goal in goals]
+
+
+def compute_goals_progress(goals: list, entries: dict, week_id: str, week_index: Optional[WeekIndex] = None) -> list:
     """Compute progress for all goals."""
-    counts = get_week_activity_counts(entries, week_id)
-    progress = []
-    for goal in goals:
-        goal_progress = detect_goal_progress(goal, counts)
-        goal_progress["goal"] = goal
-        progress.append(goal_progress)
-    return progress
+    return goal_progress(goals, get_week_activity_counts(entries, week_id, week_index))
 
 
-def auto_detect_completed_goals(goals: list, entries: dict, week_id: str) -> list:
+def auto_detect_completed_goals(goals: list, entries: dict, week_id: str, week_index: Optional[WeekIndex] = None) -> list:
     """Auto-detect which goals are completed based on entries."""
-    counts = get_week_activity_counts(entries, week_id)
-    completed = []
-    for goal in goals:
-        progress = detect_goal_progress(goal, counts)
-        if progress["completed"]:
-            completed.append(goal)
-    return completed
+    progress = compute_goals_progress(goals, entries, week_id, week_index)
+    return [p["goal"] for p in progress if p["completed"]]
 
 
-def update_weeks(existing_weeks: dict, new_parsed: dict, week_id: str, entries: dict = None) -> dict:
+def update_weeks(
+    existing_weeks: dict,
+    new_parsed: dict,
+    week_id: str,
+    entries: dict = None,
+    week_index: Optional[WeekIndex] = None
+) -> dict:
     """Update weeks data with new parsed data."""
     updated = existing_weeks.copy()
 
@@ -472,11 +774,10 @@ def update_weeks(existing_weeks: dict, new_parsed: dict, week_id: str, entries:
     explicit_completed = new_parsed.get("week_review", {}).get("goals_completed", [])
 
     # Auto-detect completed goals from entries
-    auto_completed = []
     goals_progress = []
     if entries and goals:
-        auto_completed = auto_detect_completed_goals(goals, entries, week_id)
-        goals_progress = compute_goals_progress(goals, entries, week_id)
+        goals_progress = compute_goals_progress(goals, entries, week_id, week_index)
+    auto_completed = [p["goal"] for p in goals_progress if p["completed"]]
 
     # Merge: explicit wins, then add auto-detected
     completed_set = set(g.lower() for g in explicit_completed)
@@ -493,6 +794,11 @@ def update_weeks(existing_weeks: dict, new_parsed: dict, week_id: str, entries:
         "highlight": new_parsed.get("week_review", {}).get("highlight")
     }
 
+    # Section fingerprints from the LLM parser, so unchanged goals/review can be reused next sync
+    if new_parsed.get("fingerprints"):
+        updated[week_id]["fingerprints"] = new_parsed["fingerprints"]
+        updated[week_id]["week_review"] = new_parsed.get("week_review", {})
+
     return updated
 
 
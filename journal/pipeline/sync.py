@@ -10,14 +10,27 @@ Usage:
     python sync.py --dry-run          # Show what would happen without changes
     python sync.py --no-push          # Commit but don't push
     python sync.py --fallback         # Use regex parser instead of Ollama
+    python sync.py --jobs 3           # Send up to 3 prompts to Ollama at once
+    python sync.py --no-llm-cache     # Always re-run inference, ignore cached responses
+    python sync.py --batch            # Pack several short days into one prompt
+    python sync.py --hybrid           # Regex-parse first, only send unclear days to Ollama
+    python sync.py --release-model    # Unload the Ollama model when the sync finishes
+    python sync.py --verify-stats     # Check the running stats against a full recompute
+    python sync.py --local --archive journal.md   # Stream a multi-week journal file (regex parser)
+    python sync.py --all --local --fallback -j 8  # Rebuild from weeks/*.md, parsing in 8 processes
 """
 
 import argparse
 import json
 import logging
+import os
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 # Setup logging
 logging.basicConfig(
@@ -28,19 +41,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Import pipeline modules
-from fallback_parser import parse_journal_fallback
+from archive import iter_archive_weeks
+from fallback_parser import parse_journal_fallback, patch_journal_fallback
+from sections import diff_journals, format_journal_diff
 from stats import (
+    StatsAggregate,
     compute_all_stats,
     load_books_config,
     load_entries,
-    merge_entries,
+    load_stats_state,
+    merge_entries_with_delta,
+    save_stats_state,
     update_weeks,
 )
 from topics import compute_weekly_summary, load_blog_posts
 
 # Try to import optional modules
 try:
-    from parser import parse_journal_daily
+    import llm_cache
+    import ollama_client
+    import telemetry
+    from parser import format_parse_outcomes, parse_journal_daily
     OLLAMA_AVAILABLE = True
 except ImportError:
     OLLAMA_AVAILABLE = False
@@ -72,6 +93,7 @@ def get_paths():
         "weeks_data": base / "data" / "weeks.json",
         "summaries": base / "data" / "summaries.json",
         "blog_data": base / "data" / "blog.json",
+        "stats_state": base / "cache" / "stats_state.json",
         "log": base / "logs" / "sync.log",
     }
 
@@ -140,18 +162,62 @@ def save_raw_markdown(paths: dict, week_id: str, content: str):
     logger.info(f"Saved raw markdown: {md_path.name}")
 
 
-def parse_content(content: str, week_id: str, use_fallback: bool = False) -> dict:
-    """Parse journal content using Ollama or fallback parser."""
+def log_timings(timings: dict):
+    """Log where the run's time went, with model cold-start as its own line item."""
+    logger.info("Run timing:")
+    if "model_cold" in timings:
+        logger.info(
+            f"  Model cold start: {timings['model_cold']:.1f}s "
+            f"(load {timings['model_load']:.1f}s, warm call {timings['model_warm']:.2f}s)"
+        )
+    for week_id, seconds in timings.get("weeks", {}).items():
+        logger.info(f"  {week_id}: {seconds:.1f}s")
+    if "model_release" in timings:
+        logger.info(f"  Model release: {timings['model_release']:.1f}s")
+    logger.info(f"  Total: {timings['total']:.1f}s")
+
+
+def parse_content(
+    content: str,
+    week_id: str,
+    use_fallback: bool = False,
+    jobs: int = 1,
+    batch: bool = False,
+    existing_entries: dict = None,
+    existing_week: dict = None,
+    hybrid: bool = False,
+    previous_content: Optional[str] = None
+) -> dict:
+    """
+    Parse journal content using Ollama or fallback parser.
+
+    Existing entries/week records let the Ollama parser skip sections whose
+    text hasn't changed since they were last parsed. previous_content is
+    the last saved export of this week; given that, the regex parser only
+    re-parses the days and subsections that differ from it.
+    """
     filename = f"{week_id}.md"
 
     if use_fallback or not OLLAMA_AVAILABLE:
         if not use_fallback:
             logger.warning("Ollama parser not available, using fallback")
+        if previous_content is not None and existing_entries:
+            changes = diff_journals(previous_content, content)
+            logger.info(f"Changed since last export: {format_journal_diff(changes)}")
+            return patch_journal_fallback(content, filename, changes, existing_entries, existing_week)
         logger.info("Parsing with regex fallback parser")
         return parse_journal_fallback(content, filename)
     else:
         logger.info("Parsing with Ollama (Mistral)")
-        result = parse_journal_daily(content, filename)
+        result = parse_journal_daily(
+            content,
+            filename,
+            existing_entries=existing_entries,
+            jobs=jobs,
+            batch=batch,
+            existing_week=existing_week,
+            hybrid=hybrid
+        )
         if result is None:
             logger.warning("Ollama parsing failed, falling back to regex")
             return parse_journal_fallback(content, filename)
@@ -164,27 +230,49 @@ def sync_week(
     existing_entries: dict,
     existing_weeks: dict,
     existing_summaries: dict,
-    books_config: dict,
+    aggregate: StatsAggregate,
     use_fallback: bool = False,
-    from_file: bool = False
-) -> tuple[dict, dict, dict, dict]:
+    from_file: bool = False,
+    jobs: int = 1,
+    batch: bool = False,
+    hybrid: bool = False,
+    exports: Optional[dict] = None,
+    outcomes: Optional[Counter] = None
+) -> tuple[dict, dict, dict]:
     """
     Sync a single week's journal.
 
+    The week's changes are folded into aggregate (whose week index the
+    goal and topic lookups use) and taken back out if the rest of the week
+    fails, so it keeps matching the entries the caller holds.
+
+    A Drive export is only written to weeks/ once the week has synced, as
+    the next sync diffs against it to find changed sections; writing it
+    before the entries it produced are saved would hide those changes.
+
     Args:
         week_id: Week identifier (e.g., '2025-W02')
         paths: Path dictionary
         existing_entries: Existing entries data
         existing_weeks: Existing weeks data
         existing_summaries: Existing weekly summaries
-        books_config: Books configuration
+        aggregate: Running stats for existing_entries
         use_fallback: Force use of regex parser
         from_file: Load from local file instead of Google Drive
+        jobs: Number of concurrent Ollama prompts while parsing
+        batch: Pack several short days into one Ollama prompt
+        hybrid: Regex-parse first and only send low-confidence days to Ollama
+        exports: If given, the Drive export goes here as {week_id: content}
+            for the caller to save with the data files instead of being
+            saved when the week is done
+        outcomes: If given, the week's LLM extraction outcome counts are
+            added to it, for the run's totals
 
     Returns:
-        Updated (entries, weeks, stats, summaries) tuple
+        Updated (entries, weeks, summaries) tuple
     """
     logger.info(f"Syncing week: {week_id}")
+    previous_content = None
 
     # Get content
     if from_file:
@@ -207,28 +295,228 @@ def sync_week(
         content, _, modified_time = result
         logger.info(f"Fetched from Google Drive (modified: {modified_time})")
 
-        # Save raw markdown
-        save_raw_markdown(paths, week_id, content)
+        # The last export saved, to diff against
+        md_path = paths["weeks"] / f"{week_id}.md"
+        if md_path.exists():
+            previous_content = md_path.read_text(encoding="utf-8")
 
     # Parse content
-    parsed = parse_content(content, week_id, use_fallback)
+    parsed = parse_content(
+        content,
+        week_id,
+        use_fallback,
+        jobs,
+        batch,
+        existing_entries=existing_entries,
+        existing_week=existing_weeks.get(week_id),
+        hybrid=hybrid,
+        previous_content=previous_content
+    )
+    if outcomes is not None:
+        outcomes.update(parsed.get("outcomes", {}))
 
     # Merge data
-    entries = merge_entries(existing_entries, parsed)
-    weeks = update_weeks(existing_weeks, parsed, week_id, entries)
+    entries, delta = merge_entries_with_delta(existing_entries, parsed)
+    aggregate.apply(delta)
+    logger.info(f"Stats delta: {len(delta['added'])} added, {len(delta['changed'])} changed days")
 
-    # Compute stats
-    stats = compute_all_stats(entries, weeks, books_config)
+    try:
+        weeks = update_weeks(existing_weeks, parsed, week_id, entries, aggregate.week_index)
+
+        # Generate weekly summary with topics
+        logger.info("Generating weekly summary...")
+        use_ollama = OLLAMA_AVAILABLE and not use_fallback
+        summary = compute_weekly_summary(entries, week_id, use_ollama=use_ollama, week_index=aggregate.week_index)
+    except Exception:
+        aggregate.revert(delta)
+        raise
 
-    # Generate weekly summary with topics
-    logger.info("Generating weekly summary...")
-    use_ollama = OLLAMA_AVAILABLE and not use_fallback
-    summary = compute_weekly_summary(entries, week_id, use_ollama=use_ollama)
     summaries = existing_summaries.copy()
     summaries[week_id] = summary
     logger.info(f"Generated summary with {len(summary.get('topics', []))} topics")
 
-    return entries, weeks, stats, summaries
+    # Save raw markdown
+    if not from_file:
+        if exports is None:
+            save_raw_markdown(paths, week_id, content)
+        else:
+            exports[week_id] = content
+
+    return entries, weeks, summaries
+
+
+def sync_archive(
+    archive_path: Path,
+    existing_entries: dict,
+    existing_weeks: dict,
+    existing_summaries: dict,
+    aggregate: StatsAggregate
+) -> tuple[dict, dict, dict, list[str]]:
+    """
+    Sync every week in a multi-week journal file with the streaming regex parser.
+
+    Weeks are merged as the stream yields them, so only one week's parsed
+    records are held at a time; each merge's delta is folded into aggregate.
+
+    Returns:
+        Updated (entries, weeks, summaries, synced week ids) tuple
+    """
+    logger.info(f"Streaming archive: {archive_path}")
+    entries = existing_entries
+    weeks = existing_weeks
+    summaries = existing_summaries.copy()
+    synced = []
+
+    for week_id, parsed in iter_archive_weeks(archive_path):
+        entries, delta = merge_entries_with_delta(entries, parsed)
+        aggregate.apply(delta)
+        weeks = update_weeks(weeks, parsed, week_id, entries, aggregate.week_index)
+        summaries[week_id] = compute_weekly_summary(entries, week_id, use_ollama=False, week_index=aggregate.week_index)
+        synced.append(week_id)
+        logger.info(f"  {week_id}: {len(parsed['days'])} days")
+
+    return entries, weeks, summaries, synced
+
+
+def parse_week_file(md_path: Path) -> tuple[Optional[dict], Optional[str]]:
+    """Regex-parse one weeks/*.md file; returns (parsed, None) or (None, error). Runs in pool workers."""
+    try:
+        content = md_path.read_text(encoding="utf-8")
+        return parse_journal_fallback(content, md_path.name), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def sync_local_weeks(
+    week_ids: list[str],
+    paths: dict,
+    existing_entries: dict,
+    existing_weeks: dict,
+    existing_summaries: dict,
+    aggregate: StatsAggregate,
+    processes: int = 1
+) -> tuple[dict, dict, dict, list[str]]:
+    """
+    Rebuild from local weeks/*.md files with the regex parser.
+
+    Files are parsed in a pool of processes (regex parsing is CPU-bound and
+    each week is independent), then merged in sorted week order, so the
+    result doesn't depend on which worker finished first. Each merge's delta
+    is folded into aggregate, and weekly summaries are computed once over
+    the merged entries.
+
+    Returns:
+        Updated (entries, weeks, summaries, synced week ids) tuple
+    """
+    week_ids = sorted(week_ids)
+    files = [paths["weeks"] / f"{week_id}.md" for week_id in week_ids]
+    processes = max(1, min(processes, len(files)))
+
+    start = time.time()
+    if processes > 1:
+        chunksize = max(1, len(files) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(parse_week_file, files, chunksize=chunksize))
+    else:
+        results = [parse_week_file(md_path) for md_path in files]
+    logger.info(f"Parsed {len(files)} weeks in {time.time() - start:.1f}s ({processes} processes)")
+
+    entries = existing_entries
+    weeks = existing_weeks
+    synced = []
+    for week_id, (parsed, error) in zip(week_ids, results):
+        if parsed is None:
+            logger.error(f"Failed to sync {week_id}: {error}")
+            continue
+        entries, delta = merge_entries_with_delta(entries, parsed)
+        aggregate.apply(delta)
+        weeks = update_weeks(weeks, parsed, week_id, entries, aggregate.week_index)
+        synced.append(week_id)
+
+    summaries = existing_summaries.copy()
+    for week_id in synced:
+        summaries[week_id] = compute_weekly_summary(entries, week_id, use_ollama=False, week_index=aggregate.week_index)
+
+    return entries, weeks, summaries, synced
+
+
+def finish_stats(
+    aggregate: StatsAggregate,
+    entries: dict,
+    weeks: dict,
+    books_config: dict,
+    verify: bool = False
+) -> tuple[dict, StatsAggregate]:
+    """
+    Stats from the running aggregate. With verify, also recompute them from
+    every entry; if the two differ, log where and keep the full recompute
+    (and a rebuilt aggregate) so a bad state can't reach stats.json.
+
+    Returns:
+        (stats, aggregate) tuple
+    """
+    start = time.time()
+    stats = aggregate.compute(weeks, books_config)
+    logger.info(f"Stats from running totals in {time.time() - start:.3f}s")
+    if not verify:
+        return stats, aggregate
+
+    start = time.time()
+    full = compute_all_stats(entries, weeks, books_config)
+    logger.info(f"Full stats recompute in {time.time() - start:.3f}s")
+    if json.dumps(stats, ensure_ascii=False) == json.dumps(full, ensure_ascii=False):
+        logger.info("Stats verified: running totals match a full recompute")
+        return stats, aggregate
+
+    differing = [section for section in full if json.dumps(stats.get(section)) != json.dumps(full[section])]
+    logger.error(f"Stats mismatch in {', '.join(differing) or 'key order'}; using the full recompute")
+    return full, StatsAggregate.from_entries(entries)
+
+
+def save_and_commit(
+    paths: dict,
+    entries: dict,
+    weeks: dict,
+    stats: dict,
+    summaries: dict,
+    week_label: str,
+    args,
+    aggregate: Optional[StatsAggregate] = None,
+    exports: Optional[dict] = None
+):
+    """
+    Write the data files (with blog posts) and commit them unless told not to.
+    Drive exports in exports ({week_id: content}) are saved to weeks/ after
+    the data files, so a failed save leaves the old export to diff against.
+    """
+    # Load blog posts
+    blog_posts = load_blog_posts(paths["blog"])
+    if blog_posts:
+        logger.info(f"Loaded {len(blog_posts)} blog posts")
+
+    # Save data
+    save_data(paths, entries, weeks, stats, summaries, blog_posts)
+
+    # Running stats for the next sync, tied to the entries.json just written
+    if aggregate is not None:
+        save_stats_state(aggregate, paths["stats_state"], paths["entries"])
+
+    for week_id, content in sorted((exports or {}).items()):
+        save_raw_markdown(paths, week_id, content)
+
+    # Git operations
+    if not args.no_commit and GIT_AVAILABLE:
+        logger.info("Committing changes...")
+        success, message = sync_journal_data(
+            week_id=week_label,
+            push=not args.no_push
+        )
+        if success:
+            logger.info(f"Git: {message}")
+        else:
+            logger.error(f"Git failed: {message}")
+    elif args.no_commit:
+        logger.info("Skipping git commit (--no-commit)")
 
 
 def main():
@@ -250,11 +538,48 @@ def main():
         action="store_true",
         help="Use local markdown files instead of Google Drive"
     )
+    parser.add_argument(
+        "--archive",
+        metavar="FILE",
+        help="With --local: stream every week out of one multi-week journal file (regex parser)"
+    )
     parser.add_argument(
         "--fallback",
         action="store_true",
         help="Use regex parser instead of Ollama"
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="Number of prompts to send to Ollama concurrently (default: one per host slot); "
+             "with --all --local --fallback, number of parsing processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Pack several short days into one Ollama prompt"
+    )
+    parser.add_argument(
+        "--hybrid",
+        action="store_true",
+        help="Parse with regex first and only send low-confidence days to Ollama"
+    )
+    parser.add_argument(
+        "--keep-alive",
+        default="30m",
+        help="How long Ollama keeps the model loaded between prompts (default: 30m)"
+    )
+    parser.add_argument(
+        "--release-model",
+        action="store_true",
+        help="Unload the Ollama model when the sync finishes"
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Bypass the on-disk LLM response cache"
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -265,6 +590,11 @@ def main():
         action="store_true",
         help="Commit but don't push to GitHub"
     )
+    parser.add_argument(
+        "--verify-stats",
+        action="store_true",
+        help="Also recompute stats from every entry and check the running totals against them"
+    )
     parser.add_argument(
         "--no-commit",
         action="store_true",
@@ -287,6 +617,8 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.archive and not args.local:
+        parser.error("--archive reads a local file; use it with --local")
 
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -294,6 +626,9 @@ def main():
     paths = get_paths()
     setup_file_logging(paths["log"])
 
+    if args.no_llm_cache and OLLAMA_AVAILABLE:
+        llm_cache.configure(enabled=False)
+
     logger.info("=" * 50)
     logger.info("Journal Sync Pipeline")
     logger.info("=" * 50)
@@ -327,6 +662,31 @@ def main():
 
     logger.info(f"Loaded {len(existing_entries)} existing entries")
 
+    # Archive mode: every week comes from one file, streamed
+    if args.archive:
+        archive_path = Path(args.archive)
+        if not archive_path.exists():
+            logger.error(f"Archive not found: {archive_path}")
+            sys.exit(1)
+        if args.dry_run:
+            logger.info("[DRY RUN MODE - No changes will be made]")
+            for week_id, parsed in iter_archive_weeks(archive_path):
+                logger.info(f"Would sync: {week_id} ({len(parsed['days'])} days)")
+            return
+        run_start = time.time()
+        aggregate = load_stats_state(paths["stats_state"], paths["entries"], existing_entries)
+        entries, weeks, summaries, synced = sync_archive(
+            archive_path, existing_entries, existing_weeks, existing_summaries, aggregate
+        )
+        if not synced:
+            logger.error("No weeks found in archive")
+            sys.exit(1)
+        stats, aggregate = finish_stats(aggregate, entries, weeks, books_config, verify=args.verify_stats)
+        save_and_commit(paths, entries, weeks, stats, summaries, f"{len(synced)} weeks", args, aggregate)
+        logger.info(f"Total: {time.time() - run_start:.1f}s for {len(synced)} weeks")
+        logger.info("Sync complete!")
+        return
+
     # Determine weeks to sync
     weeks_to_sync = []
 
@@ -361,53 +721,98 @@ def main():
             logger.info(f"Would sync: {week_id}")
         return
 
+    # Running stats, updated from each merge's delta instead of recomputed per week
+    aggregate = load_stats_state(paths["stats_state"], paths["entries"], existing_entries)
+
+    # Local regex rebuild: parse in a process pool, merge and compute stats once
+    if args.all and args.local and args.fallback:
+        run_start = time.time()
+        processes = max(1, args.jobs) if args.jobs else (os.cpu_count() or 1)
+        entries, weeks, summaries, synced = sync_local_weeks(
+            weeks_to_sync, paths, existing_entries, existing_weeks, existing_summaries,
+            aggregate, processes=processes
+        )
+        if not synced:
+            logger.error("No weeks synced")
+            sys.exit(1)
+        stats, aggregate = finish_stats(aggregate, entries, weeks, books_config, verify=args.verify_stats)
+        week_label = synced[0] if len(synced) == 1 else f"{len(synced)} weeks"
+        save_and_commit(paths, entries, weeks, stats, summaries, week_label, args, aggregate)
+        logger.info(f"Total: {time.time() - run_start:.1f}s for {len(synced)} weeks")
+        logger.info("Sync complete!")
+        return
+
     # Sync each week
     entries = existing_entries
     weeks = existing_weeks
     summaries = existing_summaries
-    stats = {}
+    exports = {}
+    outcomes = Counter()
+    timings = {"weeks": {}}
+    run_start = time.time()
+    use_ollama = OLLAMA_AVAILABLE and not args.fallback
+    # Default concurrency grows with the number of inference hosts
+    jobs = max(1, args.jobs) if args.jobs else (ollama_client.capacity() if use_ollama else 1)
+
+    # Load the model up front so its cold start isn't hidden inside the first prompt
+    if use_ollama:
+        metrics_path = telemetry.start_run()
+        logger.info(f"Recording inference metrics to {metrics_path}")
+        logger.info(f"Warming up Ollama model (keep_alive={args.keep_alive})...")
+        warm = ollama_client.warm_up(keep_alive=args.keep_alive)
+        if warm:
+            timings["model_cold"] = warm["cold"]
+            timings["model_load"] = warm["load"]
+            timings["model_warm"] = warm["warm"]
+            logger.info(f"Model ready: cold {warm['cold']:.1f}s, warm {warm['warm']:.2f}s")
+        else:
+            logger.warning("Ollama warm-up failed")
 
     for week_id in sorted(weeks_to_sync):
+        week_start = time.time()
         try:
-            entries, weeks, stats, summaries = sync_week(
+            entries, weeks, summaries = sync_week(
                 week_id=week_id,
                 paths=paths,
                 existing_entries=entries,
                 existing_weeks=weeks,
                 existing_summaries=summaries,
-                books_config=books_config,
+                aggregate=aggregate,
                 use_fallback=args.fallback,
-                from_file=args.local
+                from_file=args.local,
+                jobs=jobs,
+                batch=args.batch,
+                hybrid=args.hybrid,
+                exports=exports,
+                outcomes=outcomes
             )
         except Exception as e:
             logger.error(f"Failed to sync {week_id}: {e}")
             if len(weeks_to_sync) == 1:
                 sys.exit(1)
             continue
-
-    # Load blog posts
-    blog_posts = load_blog_posts(paths["blog"])
-    if blog_posts:
-        logger.info(f"Loaded {len(blog_posts)} blog posts")
-
-    # Save data
-    save_data(paths, entries, weeks, stats, summaries, blog_posts)
-
-    # Git operations
-    if not args.no_commit and GIT_AVAILABLE:
-        logger.info("Committing changes...")
-        week_label = weeks_to_sync[0] if len(weeks_to_sync) == 1 else f"{len(weeks_to_sync)} weeks"
-        success, message = sync_journal_data(
-            week_id=week_label,
-            push=not args.no_push
-        )
-        if success:
-            logger.info(f"Git: {message}")
-        else:
-            logger.error(f"Git failed: {message}")
-    elif args.no_commit:
-        logger.info("Skipping git commit (--no-commit)")
-
+        finally:
+            timings["weeks"][week_id] = time.time() - week_start
+
+    if use_ollama:
+        logger.info(llm_cache.format_stats())
+        logger.info(format_parse_outcomes(outcomes))
+        logger.info(telemetry.format_summary())
+        if len(ollama_client.get_endpoints().endpoints) > 1:
+            logger.info(ollama_client.format_endpoint_stats())
+        if args.release_model:
+            release_start = time.time()
+            ollama_client.release()
+            timings["model_release"] = time.time() - release_start
+
+    # Stats once for the whole run, from the running totals
+    stats, aggregate = finish_stats(aggregate, entries, weeks, books_config, verify=args.verify_stats)
+
+    week_label = weeks_to_sync[0] if len(weeks_to_sync) == 1 else f"{len(weeks_to_sync)} weeks"
+    save_and_commit(paths, entries, weeks, stats, summaries, week_label, args, aggregate, exports)
+
+    timings["total"] = time.time() - run_start
+    log_timings(timings)
     logger.info("Sync complete!")
 
 
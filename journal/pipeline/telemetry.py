@@ -0,0 +1,149 @@
+"""
+Per-call inference telemetry for Ollama requests.
+Captures Ollama's token counts and durations for every call, tagged with what
+the call was for, and writes them to a per-run metrics JSONL file.
+"""
+
+import json
+import math
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_METRICS_DIR = Path(__file__).parent.parent / "logs" / "metrics"
+
+# Fields Ollama reports on a finished generation (durations in nanoseconds)
+OLLAMA_FIELDS = (
+    "eval_count",
+    "eval_duration",
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "load_duration",
+    "total_duration",
+)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class MetricsRecorder:
+    """
+    Collect one record per Ollama call and append it to a JSONL file.
+
+    Records hold the call's tags (week, day, kind, ...), model, host,
+    wall-clock elapsed seconds, whether it came from the cache, and the
+    OLLAMA_FIELDS Ollama returned. Streams cut off early never get
+    Ollama's final stats; for those the client's own token count and
+    timing are recorded with "estimated": true.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.records = []
+        self._lock = threading.Lock()
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def record(self, model: str, result: Optional[dict], elapsed: float, tags: Optional[dict] = None):
+        """Record one call; result is Ollama's reply (None if the call failed)."""
+        entry = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            **(tags or {}),
+            "model": model,
+            "ok": result is not None,
+            "elapsed": round(elapsed, 3),
+        }
+        if result is not None:
+            entry["cached"] = bool(result.get("cached"))
+            if result.get("endpoint"):
+                entry["endpoint"] = result["endpoint"]
+            if result.get("estimated"):
+                entry["estimated"] = True
+            for field in OLLAMA_FIELDS:
+                if field in result:
+                    entry[field] = result[field]
+
+        with self._lock:
+            self.records.append(entry)
+            if self.path:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    print(f"  Metrics write failed: {e}")
+
+    def summary(self) -> dict:
+        """Throughput percentiles over the inference calls (cache hits excluded)."""
+        with self._lock:
+            records = list(self.records)
+
+        live = [r for r in records if r["ok"] and not r.get("cached")]
+        gen_rates = [r["eval_count"] / (r["eval_duration"] / 1e9)
+                     for r in live if r.get("eval_count") and r.get("eval_duration")]
+        prompt_rates = [r["prompt_eval_count"] / (r["prompt_eval_duration"] / 1e9)
+                        for r in live if r.get("prompt_eval_count") and r.get("prompt_eval_duration")]
+        latencies = [r["elapsed"] for r in live]
+        loads = [r["load_duration"] / 1e9 for r in live if r.get("load_duration")]
+
+        def spread(values):
+            if not values:
+                return None
+            return {p: round(percentile(values, p), 2) for p in (50, 90, 99)}
+
+        return {
+            "calls": len(records),
+            "cached": sum(1 for r in records if r.get("cached")),
+            "failed": sum(1 for r in records if not r["ok"]),
+            "gen_tokens_per_sec": spread(gen_rates),
+            "prompt_tokens_per_sec": spread(prompt_rates),
+            "latency": spread(latencies),
+            "load_seconds": round(sum(loads), 2),
+        }
+
+
+_RECORDER = MetricsRecorder()
+
+
+def get_recorder() -> MetricsRecorder:
+    return _RECORDER
+
+
+def start_run(metrics_dir: Optional[Path] = DEFAULT_METRICS_DIR) -> Optional[Path]:
+    """
+    Begin a new run: reset the records and write them to a fresh
+    run-<timestamp>.jsonl in metrics_dir (None keeps them in memory only).
+    """
+    global _RECORDER
+    path = None
+    if metrics_dir is not None:
+        path = Path(metrics_dir) / f"run-{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
+    _RECORDER = MetricsRecorder(path)
+    return path
+
+
+def record(model: str, result: Optional[dict], elapsed: float, tags: Optional[dict] = None):
+    _RECORDER.record(model, result, elapsed, tags)
+
+
+def format_summary() -> str:
+    """Throughput percentiles for end-of-run logging."""
+    s = _RECORDER.summary()
+    lines = [f"Inference: {s['calls']} calls ({s['cached']} cached, {s['failed']} failed), "
+             f"model load {s['load_seconds']}s"]
+    for key, label, unit in (
+        ("gen_tokens_per_sec", "Generation", " tok/s"),
+        ("prompt_tokens_per_sec", "Prompt eval", " tok/s"),
+        ("latency", "Latency", "s"),
+    ):
+        if s[key]:
+            p = s[key]
+            lines.append(f"  {label}: p50 {p[50]}{unit}, p90 {p[90]}{unit}, p99 {p[99]}{unit}")
+    if _RECORDER.path:
+        lines.append(f"  Metrics: {_RECORDER.path}")
+    return "\n".join(lines)
@@ -5,42 +5,25 @@ Extracts learning topics from entries and generates weekly summaries.
 
 import json
 import re
-import urllib.request
-import urllib.error
 from collections import defaultdict
 from pathlib import Path
 from typing import Optional
 
+try:
+    from .dateindex import DATES, WeekIndex
+    from .keywords import KeywordMatcher, grouped_keywords
+    from .ollama_client import call_ollama
+except ImportError:
+    from dateindex import DATES, WeekIndex
+    from keywords import KeywordMatcher, grouped_keywords
+    from ollama_client import call_ollama
 
-def call_ollama(prompt: str, model: str = "mistral", timeout: int = 120) -> Optional[str]:
-    """Call Ollama for text generation."""
-    url = "http://localhost:11434/api/generate"
 
-    payload = json.dumps({
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-        "options": {
-            "num_predict": 512,
-            "temperature": 0.7
-        }
-    }).encode('utf-8')
-
-    try:
-        req = urllib.request.Request(
-            url,
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method='POST'
-        )
-
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response", "").strip()
-
-    except Exception as e:
-        print(f"Ollama error: {e}")
-        return None
+# Generation options for the weekly narrative
+NARRATIVE_OPTIONS = {
+    "num_predict": 512,
+    "temperature": 0.7
+}
 
 
 # Common algorithm/concept patterns for LeetCode problems
@@ -61,27 +44,22 @@ ALGORITHM_PATTERNS = {
     "bit manipulation": ["bit", "xor", "bitwise"],
     "math": ["math", "gcd", "prime", "factorial"],
 }
+CATEGORY_MATCHER = KeywordMatcher(grouped_keywords(ALGORITHM_PATTERNS))
 
 
 def categorize_problem(problem: dict) -> list[str]:
     """Categorize a LeetCode problem by algorithm/concept."""
-    categories = []
-
     # Check problem name and insight
     text = f"{problem.get('name', '')} {problem.get('insight', '')}".lower()
-
-    for category, patterns in ALGORITHM_PATTERNS.items():
-        for pattern in patterns:
-            if pattern in text:
-                categories.append(category)
-                break
+    categories = CATEGORY_MATCHER.all(text)
 
     return categories if categories else ["general"]
 
 
-def extract_topics_from_entries(entries: dict, week_id: str) -> dict:
+def extract_topics_from_entries(entries: dict, week_id: str, week_index: Optional[WeekIndex] = None) -> dict:
     """
-    Extract and group topics from a week's entries.
+    Extract and group topics from a week's entries. With a WeekIndex kept in
+    step with entries, only the week's own days are looked at.
 
     Returns:
         {
@@ -112,16 +90,10 @@ def extract_topics_from_entries(entries: dict, week_id: str) -> dict:
     year, week_num = int(match.group(1)), int(match.group(2))
 
     # Filter entries for this week
-    from datetime import datetime
-    week_entries = {}
-    for date, data in entries.items():
-        try:
-            entry_date = datetime.strptime(date, "%Y-%m-%d")
-            entry_year, entry_week = entry_date.isocalendar()[:2]
-            if entry_year == year and entry_week == week_num:
-                week_entries[date] = data
-        except:
-            continue
+    if week_index is not None:
+        week_entries = {date: entries[date] for date in week_index.dates(year, week_num)}
+    else:
+        week_entries = {date: data for date, data in entries.items() if DATES.iso_week(date) == (year, week_num)}
 
     topics = {
         "leetcode": defaultdict(list),
@@ -311,7 +283,11 @@ Week activities:
 
 Write the summary (one flowing sentence):"""
 
-        response = call_ollama(prompt)
+        # The prompt is built from the week's entries, so a cached sample is
+        # reused until they change
+        response, _ = call_ollama(
+            prompt, options=NARRATIVE_OPTIONS, tags={"week": week_id, "kind": "narrative"}, cacheable=True
+        )
         if response:
             # Clean up the response
             narrative = response.strip()
@@ -336,7 +312,12 @@ Write the summary (one flowing sentence):"""
     return "Worked on various things this week."
 
 
-def compute_weekly_summary(entries: dict, week_id: str, use_ollama: bool = True) -> dict:
+def compute_weekly_summary(
+    entries: dict,
+    week_id: str,
+    use_ollama: bool = True,
+    week_index: Optional[WeekIndex] = None
+) -> dict:
     """
     Compute full weekly summary with topics and narrative.
 
@@ -348,7 +329,7 @@ def compute_weekly_summary(entries: dict, week_id: str, use_ollama: bool = True)
             "raw_topics": {...grouped topics...}
         }
     """
-    topics = extract_topics_from_entries(entries, week_id)
+    topics = extract_topics_from_entries(entries, week_id, week_index)
     highlights = generate_topic_highlights(topics)
     narrative = generate_weekly_narrative(topics, week_id, use_ollama)
 